@@ -0,0 +1,237 @@
+import json
+import os
+import subprocess
+import tempfile
+import time
+import tracemalloc
+import numpy
+from DAQDevice import SimDevice
+from DAQStream import DAQStream
+from SampleBuffer import ChunkedBuffer
+from SessionFile import SessionWriter
+
+'''
+Date: October, 2026
+Summary: Headless acquisition benchmark run against the simulated device. Sweeps channel count, sample
+rate and block size through the same paths the interfaces use (DAQStream into memory or to a session
+file, and a single finite read as in EMGInterface). Every configuration is run twice:
+    - paced by the device clock, as in a real recording, reporting block latency percentiles, peak
+      memory, and the overruns/pool misses that show the pipeline falling behind
+    - unpaced (device producing samples as fast as they are read), reporting the maximum sustained
+      throughput of the pipeline, i.e. how far above the configured rate it could keep up
+Each run is appended to RESULTS_FILE together with the current git revision, and compared against the
+previous run of the same configuration.
+Run from the repository root with: python AcqBenchmark.py
+'''
+
+RESULTS_FILE = os.path.join('benchmarks', 'AcqBenchmarkResults.jsonl')
+
+
+'''
+Helper function that returns the current git revision, or 'unknown' outside of a checkout
+'''
+def gitRevision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+'''
+Helper function that opens the store for a run, in memory or in a session file (mode 'memory' or 'disk')
+'''
+def openStore(mode, tempDir, numChan, sampFreq, numSamp):
+    if mode == 'disk':
+        return SessionWriter(os.path.join(tempDir, 'bench.dgs'), numChan, sampFreq)
+    #Reserved to the expected length with chunks bounded in bytes, so the peak follows the recording size
+    return ChunkedBuffer(numChan, chunkSize=max(1, numSamp // 8), reserve=numSamp)
+
+
+def storeBlock(store, block):
+    if isinstance(store, SessionWriter):
+        store.write(block)
+    else:
+        store.append(block)
+
+
+'''
+Runs a continuous acquisition paced by the device clock for the given duration, collecting blocks every
+pollInterval seconds like the ConInterface record loop and storing them (mode 'memory' or 'disk').
+Block latency is measured from the moment the block's last sample was acquired to the moment it has
+been stored. Peak memory includes the store.
+'''
+def runStream(numChan, sampFreq, blockSize, mode, duration, pollInterval=0.02):
+    device = SimDevice(seed=0)
+    device.configure(numChan, sampFreq)
+    stream = DAQStream(device, blockSize)
+
+    tempDir = tempfile.TemporaryDirectory()
+    tracemalloc.start()
+    store = openStore(mode, tempDir.name, numChan, sampFreq, int(sampFreq * duration * 1.2))
+
+    latencies = []
+    stream.start()
+    endTime = time.perf_counter() + duration
+    while time.perf_counter() < endTime:
+        time.sleep(pollInterval)
+        for entry in stream.getBlocks(withTimes=True):
+            if entry is None:
+                continue
+            block, acquiredTime = entry
+            storeBlock(store, block)
+            latencies.append(time.perf_counter() - acquiredTime)
+            stream.release(block)
+    stream.stop()
+    for block in stream.getBlocks():
+        if block is not None:
+            storeBlock(store, block)
+    peakMemory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    if mode == 'disk':
+        store.close()
+    tempDir.cleanup()
+
+    return makeResult(numChan, sampFreq, blockSize, mode, latencies, peakMemory, stream)
+
+
+'''
+Streams numSamp samples per channel from an unpaced device through DAQStream into the store as fast as
+the pipeline allows, and returns the sustained throughput in samples per second per channel
+'''
+def runUnpaced(numChan, sampFreq, blockSize, mode, numSamp):
+    device = SimDevice(seed=0, speed=0)
+    device.configure(numChan, sampFreq)
+    stream = DAQStream(device, blockSize, numSamp=numSamp, backpressure=True)
+
+    tempDir = tempfile.TemporaryDirectory()
+    store = openStore(mode, tempDir.name, numChan, sampFreq, numSamp)
+    received = 0
+    startTime = time.perf_counter()
+    stream.start()
+    done = False
+    while not done:
+        for block in stream.getBlocks(timeout=1.0):
+            if block is None:
+                done = True
+                continue
+            storeBlock(store, block)
+            received += block.shape[1]
+            stream.release(block)
+    elapsed = time.perf_counter() - startTime
+    stream.stop()
+
+    if mode == 'disk':
+        store.close()
+    tempDir.cleanup()
+    return received / elapsed
+
+
+'''
+Runs a finite acquisition of duration seconds in one read, as EMGInterface.recordSession does
+'''
+def runFinite(numChan, sampFreq, duration):
+    numSamp = int(sampFreq * duration)
+    device = SimDevice(seed=0)
+    device.configure(numChan, sampFreq, numSamp=numSamp)
+
+    tracemalloc.start()
+    device.start()
+    values = numpy.zeros((numChan, numSamp), dtype=numpy.float64)
+    device.read(values, timeout=duration + 10)
+    latency = time.perf_counter() - (device.startTime + duration)
+    peakMemory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    device.stop()
+    result = makeResult(numChan, sampFreq, numSamp, 'finite', [latency], peakMemory, None)
+
+    #Same read from an unpaced device
+    device = SimDevice(seed=0, speed=0)
+    device.configure(numChan, sampFreq, numSamp=numSamp)
+    device.start()
+    startTime = time.perf_counter()
+    device.read(values)
+    result['maxThroughput'] = numSamp / (time.perf_counter() - startTime)
+    return result
+
+
+'''
+Helper function that builds the result of a paced run. overruns and poolMisses come from the stream's
+timing monitor and are the signs of the pipeline falling behind the device.
+'''
+def makeResult(numChan, sampFreq, blockSize, mode, latencies, peakMemory, stream):
+    latencies = numpy.array(latencies) * 1000 if latencies else numpy.zeros(1)
+    error = None if stream is None else stream.error
+    return {'mode': mode, 'numChan': numChan, 'sampFreq': sampFreq, 'blockSize': blockSize,
+            'maxThroughput': None,
+            'overruns': 0 if stream is None else stream.monitor.overruns,
+            'poolMisses': 0 if stream is None else stream.monitor.poolMisses,
+            'latencyP50': float(numpy.percentile(latencies, 50)),
+            'latencyP95': float(numpy.percentile(latencies, 95)),
+            'latencyMax': float(numpy.max(latencies)),
+            'peakMemoryMB': peakMemory / 2 ** 20, 'error': None if error is None else str(error)}
+
+
+'''
+Helper function that returns the most recent stored result for every configuration
+'''
+def loadPrevious(resultsPath):
+    previous = {}
+    if not os.path.exists(resultsPath):
+        return previous
+    with open(resultsPath) as file:
+        for line in file:
+            run = json.loads(line)
+            for result in run['results']:
+                previous[configKey(result)] = result
+    return previous
+
+
+def configKey(result):
+    return result['mode'], result['numChan'], result['sampFreq'], result['blockSize']
+
+
+def printResult(result, previous):
+    line = '%-6s %4d ch %6d Hz %6d blk %7.0fx rate %4d ovr %4d miss %7.1f %7.1f %7.1f ms %7.1f MB' % (
+        result['mode'], result['numChan'], result['sampFreq'], result['blockSize'],
+        result['maxThroughput'] / result['sampFreq'], result['overruns'], result['poolMisses'],
+        result['latencyP50'], result['latencyP95'], result['latencyMax'], result['peakMemoryMB'])
+    if previous is not None and previous['latencyP95'] > 0:
+        change = (result['latencyP95'] - previous['latencyP95']) / previous['latencyP95'] * 100
+        line += '  p95 %+.0f%% vs %s' % (change, previous.get('revision', '?'))
+    if result['error'] is not None:
+        line += '  ERROR: ' + result['error']
+    print(line)
+
+
+if __name__ == '__main__':
+    duration = 2.0
+    channelCounts = [1, 8, 32]
+    sampleRates = [1000, 10000]
+    #Block sizes as fractions of a second of data
+    blockFractions = [0.01, 0.05]
+
+    revision = gitRevision()
+    previous = loadPrevious(RESULTS_FILE)
+    print('mode   chans   rate     block  max throughput  overruns/pool misses  latency p50/p95/max  peak mem')
+
+    results = []
+    for numChan in channelCounts:
+        for sampFreq in sampleRates:
+            for fraction in blockFractions:
+                blockSize = max(1, int(sampFreq * fraction))
+                for mode in ('memory', 'disk'):
+                    results.append(runStream(numChan, sampFreq, blockSize, mode, duration))
+                    results[-1]['maxThroughput'] = runUnpaced(numChan, sampFreq, blockSize, mode,
+                                                              int(sampFreq * duration))
+                    printResult(results[-1], previous.get(configKey(results[-1])))
+            results.append(runFinite(numChan, sampFreq, duration))
+            printResult(results[-1], previous.get(configKey(results[-1])))
+
+    for result in results:
+        result['revision'] = revision
+    os.makedirs(os.path.dirname(RESULTS_FILE), exist_ok=True)
+    with open(RESULTS_FILE, 'a') as file:
+        file.write(json.dumps({'revision': revision, 'time': time.time(), 'results': results}) + '\n')
+    print('Results appended to ' + RESULTS_FILE)
@@ -3,15 +3,20 @@ from tkinter import *
 
 from PIL import ImageTk, Image
 from tkinter import messagebox
-from tkinter.filedialog import asksaveasfilename
+from tkinter.filedialog import askopenfilename, asksaveasfilename
 import numpy
-import nidaqmx
-import nidaqmx.system._collections.device_collection as device
-from nidaqmx.constants import Edge
 import matplotlib.pyplot as plt
-with nidaqmx.Task() as readTask:
+from DAQDevice import DAQError, openDevice, readChannelList
+from Conditioning import emgPipeline
+from DAQStream import DAQStream
+from Decimation import MinMaxPyramid, linkPyramid
+from LivePlot import LivePlot
+from OnlineRecognizer import OnlineRecognizer, loadModel, streamTiming
+from SampleBuffer import ChunkedBuffer
+from SessionFile import SESSION_EXT, SessionWriter, openSession, saveSession
+from SessionHealth import checkHealth
+with openDevice() as daqDevice:
 
-#TODO: Fix single channel (other todo)
     #Create tk root and properties
     root = Tk()
     root.title('Continuous Interface')
@@ -30,35 +35,50 @@ with nidaqmx.Task() as readTask:
     footerFrame.pack(side='bottom', fill='x', padx=5)
     label.pack(side='right', padx=5, pady=5)
 
-    #Start boolean flag as False, list as empty
+    #Start boolean flag as False, recording buffer is created once the channels are known
     check = False
-    data = []
+    data = None
+    stream = None
+    writer = None
+    livePlot = None
+    liveWindow = None
+    conditioner = None
+    modelSettings = None
+    recognizer = None
+    pollMs = 20
 
     def config():
-        global numChan
+        global numChan, sampFreq, conditioner
         numChan = chanNumber.get()
-        if checkEntry(numChan):
-            #Convert string entry into integer
+        sampFreq = frequency.get()
+        #A channel list (possibly spanning several devices) sets the channel count itself
+        try:
+            channels, numChan = readChannelList(channelList.get(), numChan)
+        except DAQError as err:
+            messagebox.showerror('Invalid Parameters', str(err))
+            return False
+        if checkEntry(numChan) and checkEntry(sampFreq):
+            #Convert string entries into integers
             numChan = int(numChan)
-
-            #Set up device and channels, check for errors
+            sampFreq = int(sampFreq)
+
+            #Set up optional streaming conditioning (band-pass and notch, plus envelope if selected)
+            conditioner = None
+            if filterOn.get() or envelopeOn.get():
+                try:
+                    conditioner = emgPipeline(numChan, sampFreq, envelope=envelopeOn.get())
+                except ValueError as err:
+                    messagebox.showerror('Invalid Parameters', str(err))
+                    return False
+
+            #Set up device channels and continuous sample clock, check for errors
+            #(device range, or DAQ not recognized by system)
             try:
-                devNameList = device.DeviceCollection.device_names.__get__(0)
-                devName = devNameList[0]
-                readTask.ai_channels.add_ai_voltage_chan(devName + '/ai0:'
-                                                         + str(int(numChan) - 1),
-                                                         terminal_config=nidaqmx.constants.TerminalConfiguration.RSE)
-            #Channel number exceeds device range
-            except nidaqmx.errors.DaqError:
-                messagebox.showerror('DAQ Error', 'Ensure channel number is within device range.')
-                raise
-            #DAQ is not recognized by system (i.e. not plugged in)
-            except IndexError:
-                messagebox.showerror('DAQ Error', 'System cannot find DAQ, ensure device is plugged in')
+                daqDevice.configure(numChan, sampFreq, channels=channels)
+            except DAQError as err:
+                messagebox.showerror('DAQ Error', str(err))
                 raise
 
-            readTask.timing.cfg_samp_clk_timing(rate=100, sample_mode=nidaqmx.constants.AcquisitionType.CONTINUOUS)
-
             #Return true if all checks and set up pass
             return True
 
@@ -86,28 +106,98 @@ with nidaqmx.Task() as readTask:
         return True
 
     '''
-    Sets the boolean flag to True, allowing the record function to read in data.
-    Also deactivates the start button, and activates the stop button.
+    Starts the background acquisition stream and sets the boolean flag to True, allowing the
+    record function to collect data. Also deactivates the start button, and activates the stop button.
     '''
     def start():
         if config():
-            global check
+            global check, stream, data, writer, livePlot, liveWindow, recognizer, pollMs
+            #Stream to disk mode writes every block straight to a session file instead of keeping it in memory
+            if toDisk.get():
+                file = asksaveasfilename(defaultextension=SESSION_EXT,
+                                         filetypes=[('Session Files', '*' + SESSION_EXT), ('All Files', '*.*')])
+                if not file:
+                    return
+                writer = SessionWriter(file, numChan, sampFreq)
+            else:
+                #Reserve up to 10 minutes (capped at SampleBuffer.RESERVE_BYTES) so stop() usually needs no copy
+                data = ChunkedBuffer(numChan, reserve=sampFreq * 600)
+
+            #Read blocks of ~50 ms so the GUI only has to handle a few blocks per refresh
+            blockSize = max(1, sampFreq // 20)
+            pollMs = 20
+
+            #Online gesture recognition on the raw stream if a model was loaded, with blocks small and
+            #polled often enough to fit its latency budget
+            if modelSettings is not None:
+                recognizer = OnlineRecognizer(numChan, modelSettings)
+                blockSize, pollSeconds = streamTiming(sampFreq, recognizer.latencyBudget)
+                pollMs = max(1, int(pollSeconds * 1000))
+
+            #Live view of the last few seconds in its own window, closing it leaves the recording running
+            liveWindow = Toplevel(root)
+            liveWindow.title('Live View')
+            liveWindow.protocol('WM_DELETE_WINDOW', closeLive)
+            livePlot = LivePlot(liveWindow, numChan, sampFreq)
+
+            stream = DAQStream(daqDevice, blockSize)
+            stream.start()
             check = True
             stopBtn['state'] = NORMAL
             startBtn['state'] = DISABLED
 
 
     '''
-    Continuously reads in a single sample from the desired number of channels at a frequency 
-    of 100Hz. The samples are compiled into a single data set that is later exported to a .txt file.
+    Periodically collects the blocks read by the acquisition thread. Sampling is clocked by the DAQ,
+    so this loop only has to keep up on average. The blocks are either compiled into a single data set
+    that is later exported, or appended to the session file when streaming to disk.
     '''
     def record():
-        # TODO: If only one channel, returns scalar, not list
         if check:
-            sample = readTask.read()
-            print(sample[:])
-            data.append(sample)
-        root.after(1, record)
+            for entry in stream.getBlocks(withTimes=True):
+                #Stream only ends by itself if acquisition failed, finish now so the error is shown at once
+                if entry is None:
+                    stop()
+                    return
+                storeBlock(*entry)
+                stream.release(entry[0])
+            #Redraws at most at the live view's frame rate cap
+            if livePlot is not None:
+                livePlot.refresh()
+        root.after(pollMs, record)
+
+
+    '''
+    Helper function that closes the live view window, used by its close button and when recording stops
+    '''
+    def closeLive():
+        global livePlot, liveWindow
+        if liveWindow is not None:
+            livePlot.close()
+            liveWindow.destroy()
+        livePlot = None
+        liveWindow = None
+
+
+    '''
+    Helper function that conditions a block if enabled, then copies it into the recording buffer
+    or session file, and the live view
+    '''
+    def storeBlock(block, acquiredTime=None):
+        #Recognizer sees the raw signal, matching the features GDPreprocessor computes for training
+        if recognizer is not None:
+            prediction = recognizer.push(block, acquiredTime)
+            if prediction is not None:
+                gestureLabel['text'] = 'Gesture: ' + str(prediction) + \
+                                       ' (' + str(round(recognizer.computeTimes[-1] * 1000, 1)) + ' ms)'
+        if conditioner is not None:
+            block = conditioner.process(block)
+        if writer is not None:
+            writer.write(block)
+        else:
+            data.append(block)
+        if livePlot is not None:
+            livePlot.append(block)
 
 
     '''
@@ -119,15 +209,33 @@ with nidaqmx.Task() as readTask:
         global check
         check = False
 
-        #Stop task
-        readTask.stop()
-
-        #Convert compiled list to numpy array
-        dataArray = numpy.array(data)
+        #Stop acquisition thread and task, keeping any blocks still in the queue
+        stream.stop()
+        for block in stream.getBlocks():
+            if block is not None:
+                storeBlock(block)
+        if stream.error is not None:
+            messagebox.showerror('DAQ Error', str(stream.error))
+        closeLive()
+        if recognizer is not None:
+            print('Recognition: ' + str(recognizer.report()))
+        checkHealth(stream.monitor)
+
+        if writer is not None:
+            #Session is already on disk, map it back in for plotting, health report goes next to it
+            writer.close()
+            stream.monitor.save(writer.path)
+            dataArray = openSession(writer.path)[1]
+            plotChannels(dataArray)
+        else:
+            #Get the whole recording with channels as columns
+            dataArray = data.toArray().T
 
-        #Call helper functions to plot and save
-        plotChannels(dataArray)
-        askSave(dataArray)
+            #Call helper functions to plot and save, health report goes next to the saved file
+            plotChannels(dataArray)
+            savedFile = askSave(dataArray)
+            if savedFile is not None:
+                stream.monitor.save(savedFile)
 
         #Quit the program
         root.destroy()
@@ -135,30 +243,38 @@ with nidaqmx.Task() as readTask:
     '''
     Helper function which takes in the 2D matrix for the channel data. The function
     can support up to 6 channels, with any number dynamically resizing to take up the total figure space.
+    Long recordings are drawn from a min/max pyramid, so each view only plots a few thousand points
+    per channel and zooming in fetches finer detail.
     '''
     def plotChannels(yAxisMatrix):
-        #Set up time axis
+        #Build level of detail pyramid once, then set up time axis for the full view
         numSamp = len(yAxisMatrix)
-        duration = numpy.arange(numSamp)
-        timeArray = duration * 0.01
+        pyramid = MinMaxPyramid(yAxisMatrix)
+        sampleIndices, yView = pyramid.query(0, numSamp)
+        timeArray = sampleIndices / sampFreq
 
         #Set figure and color list for channels
         fig = plt.figure()
         colors = ['green', 'yellow', 'blue', 'red', 'black', 'orange']
 
         #Plot channels
+        axes = []
+        lines = []
         for position in range(0, numChan):
-            plt.subplot(numChan, 1, position + 1)
+            axes.append(plt.subplot(numChan, 1, position + 1, sharex=axes[0] if axes else None))
             #Checks to see if EMG spiker shield channels are surpassed, color defaults to purple
             if position > 5:
                 colorStr = 'purple'
             else:
                 colorStr = colors[position]
-            plt.plot(timeArray, yAxisMatrix[:, position], color=colorStr, label='C.' + str(position))
+            lines.extend(plt.plot(timeArray, yView[:, position], color=colorStr, label='C.' + str(position)))
             plt.legend(loc='upper right', handlelength=0, handletextpad=0, fancybox=True)
             plt.grid()
             plt.yticks([2.5])
 
+        #Re-query the pyramid whenever the visible time range changes
+        linkPyramid(axes, lines, pyramid, sampFreq)
+
         #Set overall labels
         plt.subplots_adjust(hspace=.0)
         fig.supxlabel('Time (s)')
@@ -172,7 +288,8 @@ with nidaqmx.Task() as readTask:
 
     '''
     Helper function that asks the user for a file name and path via the file dialog,
-    saving the generated .txt file from the recorded session
+    saving the recorded session as a .txt file, or as a binary session file if that extension is chosen.
+    Returns the saved file name, or None if nothing was saved
     '''
     def askSave(data):
         response = messagebox.askyesno('File Save Confirmation', 'Would you like to save the .txt file?\n ' +
@@ -181,17 +298,22 @@ with nidaqmx.Task() as readTask:
         if response:
             #Set up dialog
             file = asksaveasfilename(defaultextension='.txt',
-                                     filetypes=[('All Files', '*.*'), ('Text Documents', '*.txt')])
+                                     filetypes=[('All Files', '*.*'), ('Text Documents', '*.txt'),
+                                                ('Session Files', '*' + SESSION_EXT)])
 
             #Handle exception if user exits file dialog
-            if file is None:
-                return
+            if not file:
+                return None
 
-            #Save text file to specified file
-            numpy.savetxt(file, data, fmt='%.2e')
+            #Save binary session file, or text file, to specified file
+            if file.endswith(SESSION_EXT):
+                saveSession(file, data, sampFreq)
+            else:
+                numpy.savetxt(file, data, fmt='%.2e')
+            return file
 
-        else:
-            plt.close('all')
+        plt.close('all')
+        return None
 
 
     #Channel Label
@@ -200,6 +322,49 @@ with nidaqmx.Task() as readTask:
     #Channel Entry
     chanNumber = Entry(root, borderwidth=3, bg='light blue', font=entryFont)
     chanNumber.pack(padx=10)
+    #Channel List Label
+    listLabel = Label(root, text='Channel List (optional, e.g. Dev1/ai0:3,Dev2/ai0:7)\n'
+                                 'Columns follow the list, give each device\'s channels together',
+                      bg='light gray', font=labelFont)
+    listLabel.pack(padx=5, pady=(10, 0))
+    #Channel List Entry
+    channelList = Entry(root, borderwidth=3, bg='light blue', font=entryFont)
+    channelList.pack(padx=10)
+    #Frequency Label
+    fqLabel = Label(root, text='Sample Frequency (Hz)', bg='light gray', font=labelFont)
+    fqLabel.pack(padx=5, pady=(10, 0))
+    #Frequency Entry
+    frequency = Entry(root, borderwidth=3, bg='light blue', font=entryFont)
+    frequency.pack(padx=10)
+    #Stream to disk toggle
+    toDisk = BooleanVar(value=False)
+    diskCheck = Checkbutton(root, text='Stream to Disk', variable=toDisk, bg='light gray', font=labelFont)
+    diskCheck.pack(padx=5, pady=(10, 0))
+    #Signal conditioning toggles
+    filterOn = BooleanVar(value=False)
+    filterCheck = Checkbutton(root, text='Filter Signal', variable=filterOn, bg='light gray', font=labelFont)
+    filterCheck.pack(padx=5)
+    envelopeOn = BooleanVar(value=False)
+    envelopeCheck = Checkbutton(root, text='Envelope', variable=envelopeOn, bg='light gray', font=labelFont)
+    envelopeCheck.pack(padx=5)
+
+    '''
+    Command function for the load model button, loads a classifier saved with OnlineRecognizer.saveModel
+    so gestures are recognized live during the next recording
+    '''
+    def askModel():
+        global modelSettings
+        file = askopenfilename(filetypes=[('Model Files', '*.pkl'), ('All Files', '*.*')])
+        if not file:
+            return
+        modelSettings = loadModel(file)
+        gestureLabel['text'] = 'Gesture: -'
+
+    #Load Model Button and recognized gesture
+    modelBtn = Button(root, text='Load Model', command=askModel, font=btnFont)
+    modelBtn.pack(padx=5, pady=(10, 0))
+    gestureLabel = Label(root, text='No model loaded', bg='light gray', font=labelFont)
+    gestureLabel.pack(padx=5)
 
     #Start Button
     startBtn = Button(root, text='Start', command=start, font=btnFont)
@@ -209,5 +374,5 @@ with nidaqmx.Task() as readTask:
     stopBtn = Button(root, text='Stop', command=stop, font=btnFont, fg='red', state=DISABLED, padx=6)
     stopBtn.pack(side='right', padx=(0, 20), pady=15)
 
-    root.after(1, record)
+    root.after(20, record)
     root.mainloop()
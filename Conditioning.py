@@ -0,0 +1,118 @@
+import time
+import numpy
+from scipy import signal
+
+'''
+Date: October, 2026
+Summary: Streaming EMG signal conditioning. Each stage processes (numChan, n) blocks for all channels at
+once and carries its state (filter delays, moving window tail) from one block to the next, so running
+a recording through block by block gives the same result as filtering the whole recording offline,
+while the work per block only depends on the block length.
+'''
+
+#Mains frequency removed by the notch filter (Hz)
+MAINS_FREQ = 60
+
+
+'''
+Stateful IIR filter given as second-order sections. Starting from a zero state, filtering blocks in
+sequence matches scipy.signal.sosfilt over the concatenated signal.
+'''
+class SOSFilter:
+    def __init__(self, sos, numChan):
+        self.sos = sos
+        self.state = numpy.zeros((sos.shape[0], numChan, 2))
+
+    def process(self, block):
+        filtered, self.state = signal.sosfilt(self.sos, block, axis=-1, zi=self.state)
+        return filtered
+
+
+'''
+Returns a Butterworth band-pass filter stage. The upper edge is clamped below the Nyquist frequency
+so the same settings work at low sample rates.
+'''
+def bandPass(numChan, sampFreq, low=20.0, high=450.0, order=4):
+    high = min(high, 0.45 * sampFreq)
+    if low >= high:
+        raise ValueError('Band-pass low edge must be below ' + str(high) + ' Hz at ' + str(sampFreq) + ' Hz')
+    return SOSFilter(signal.butter(order, [low, high], btype='bandpass', fs=sampFreq, output='sos'), numChan)
+
+
+'''
+Returns a notch filter stage removing a single frequency (mains interference by default)
+'''
+def notch(numChan, sampFreq, freq=MAINS_FREQ, quality=30.0):
+    b, a = signal.iirnotch(freq, quality, fs=sampFreq)
+    return SOSFilter(signal.tf2sos(b, a), numChan)
+
+
+'''
+Full-wave rectification
+'''
+class Rectifier:
+    def process(self, block):
+        return numpy.abs(block)
+
+
+'''
+Returns a linear envelope stage: full-wave rectification followed by a Butterworth low-pass filter
+'''
+def linearEnvelope(numChan, sampFreq, cutoff=6.0, order=2):
+    lowPass = SOSFilter(signal.butter(order, cutoff, btype='lowpass', fs=sampFreq, output='sos'), numChan)
+    return ConditioningPipeline([Rectifier(), lowPass])
+
+
+'''
+Moving RMS over the last window samples, one output per input sample. The squared tail of the previous
+block is kept so windows spanning block boundaries are exact; the first window - 1 outputs of a
+recording treat the missing history as zeros.
+'''
+class MovingRMS:
+    def __init__(self, numChan, window):
+        self.window = window
+        self.tail = numpy.zeros((numChan, window))
+
+    def process(self, block):
+        numNew = block.shape[1]
+        if numNew == 0:
+            return numpy.zeros(block.shape)
+        squares = numpy.concatenate((self.tail, block**2), axis=1)
+        prefix = numpy.cumsum(squares, axis=1)
+        windowSums = prefix[:, -numNew:] - prefix[:, -numNew - self.window:-self.window]
+        self.tail = squares[:, -self.window:]
+        return numpy.sqrt(numpy.maximum(windowSums, 0.0) / self.window)
+
+
+'''
+Chain of conditioning stages applied in order to every block. lastSeconds holds the processing
+time of the most recent block.
+'''
+class ConditioningPipeline:
+    def __init__(self, stages):
+        self.stages = list(stages)
+        self.lastSeconds = 0.0
+
+    def process(self, block):
+        startTime = time.perf_counter()
+        for stage in self.stages:
+            block = stage.process(block)
+        self.lastSeconds = time.perf_counter() - startTime
+        return block
+
+
+'''
+Returns the standard EMG chain: band-pass and mains notch (skipped when mains is above the Nyquist
+frequency), optionally followed by the linear envelope or by a moving RMS over rmsMs milliseconds
+'''
+def emgPipeline(numChan, sampFreq, envelope=False, rmsMs=None):
+    if envelope and rmsMs is not None:
+        raise ValueError('Choose either the linear envelope or the moving RMS')
+    stages = [bandPass(numChan, sampFreq)]
+    if MAINS_FREQ < sampFreq / 2:
+        stages.append(notch(numChan, sampFreq))
+    if envelope:
+        stages.append(linearEnvelope(numChan, sampFreq))
+    if rmsMs is not None:
+        stages.append(MovingRMS(numChan, max(1, int(sampFreq * rmsMs / 1000))))
+    return ConditioningPipeline(stages)
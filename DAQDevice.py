@@ -0,0 +1,337 @@
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy
+
+'''
+Date: October, 2026
+Summary: Device backends for the acquisition interfaces. Every backend offers the same small buffered
+read interface (configure, start, read into a (numChan, n) block, stop, close), so the interfaces and
+DAQStream can run against a National Instruments DAQ or against a software simulator that produces
+synthetic EMG, or replays a recording, at the configured rate.
+The backend is picked by the DATAGETTER_DEVICE environment variable: 'ni' (default), 'sim', or the
+path of a recording (.txt, .npy or session file) to replay. Replay runs in real time unless
+DATAGETTER_REPLAY_SPEED sets a speed factor (e.g. 10); see Replay for headless replay as fast as possible.
+Channels can be given as a list spanning several devices (e.g. 'Dev1/ai0:3,Dev2/ai0:7'); the devices
+share the first device's sample clock and start trigger and are read in parallel into one block.
+'''
+
+
+'''
+Raised by every backend for configuration and acquisition failures, with a message suitable for the user
+'''
+class DAQError(Exception):
+    pass
+
+
+'''
+Raised when samples were lost because the device buffer filled up before they were read
+'''
+class DAQOverrun(DAQError):
+    pass
+
+
+'''
+Splits a channel list such as 'Dev1/ai0:3,Dev1/ai6,Dev2/ai0:7' into one (deviceName, physicalChannels,
+count) entry per device, in list order. Channels of one device are read by one task, so the list must give
+each device's channels together; a list returning to an earlier device raises DAQError rather than having
+its columns silently reordered. The acquired block then has its rows in exactly the order of the list.
+'''
+def parseChannels(spec):
+    groups = {}
+    for item in spec.split(','):
+        match = re.fullmatch(r'\s*([^/\s]+)/ai(\d+)(?::(\d+))?\s*', item)
+        if match is None:
+            raise DAQError('Invalid channel list entry: ' + item.strip() + ' (expected e.g. Dev1/ai0:3)')
+        devName, first, last = match.group(1), int(match.group(2)), match.group(3)
+        if devName in groups and devName != list(groups)[-1]:
+            raise DAQError('Channel list returns to ' + devName + ' after another device, list the channels '
+                           'of each device together')
+        last = first if last is None else int(last)
+        groups.setdefault(devName, []).append((match.group(0).strip(), abs(last - first) + 1))
+    return [(devName, ','.join(name for name, _ in items), sum(count for _, count in items))
+            for devName, items in groups.items()]
+
+
+'''
+Returns the total number of channels in a channel list
+'''
+def countChannels(spec):
+    return sum(count for _, _, count in parseChannels(spec))
+
+
+'''
+Helper function for the interfaces that reads a channel list entry. Returns (channels, numChan), with
+numChan counted from the list, or (None, numChan) unchanged if the entry is blank. Raises DAQError if the
+list is invalid.
+'''
+def readChannelList(text, numChan):
+    channels = text.strip() or None
+    if channels is None:
+        return None, numChan
+    return channels, countChannels(channels)
+
+
+'''
+Helper function that checks a channel list, if given, matches the requested channel count
+'''
+def checkChannels(numChan, channels):
+    if channels is not None and countChannels(channels) != numChan:
+        raise DAQError('Channel list has ' + str(countChannels(channels)) + ' channels, expected ' + str(numChan))
+
+
+'''
+Returns a new device for the backend named by kind, or by DATAGETTER_DEVICE if kind is None.
+speed is the replay speed factor, DATAGETTER_REPLAY_SPEED (default 1) if None.
+'''
+def openDevice(kind=None, speed=None):
+    if kind is None:
+        kind = os.environ.get('DATAGETTER_DEVICE', 'ni')
+    if speed is None:
+        speed = float(os.environ.get('DATAGETTER_REPLAY_SPEED', 1.0))
+    if kind == 'ni':
+        return NIDevice()
+    if kind == 'sim':
+        return SimDevice()
+    return SimDevice(replayPath=kind, speed=speed)
+
+
+'''
+Backend for National Instruments DAQs. Reads channels ai0 to ai(numChan - 1) of the first device found
+on the system, or any channel list (see parseChannels). With several devices there is one task per
+device: the first device is the master, the others use its sample clock and start trigger (shared over
+the PXI backplane or an RTSI cable), and every read fills each device's rows of the block in parallel.
+'''
+class NIDevice:
+    def __init__(self):
+        import nidaqmx
+        self.tasks = []
+        self.readers = []
+        #(first, last + 1) rows of the block filled by each task
+        self.rows = []
+        self.pool = None
+        self.numChan = 0
+        self.sampFreq = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    '''
+    Adds the voltage channels and sets up the sample clock. Acquisition is continuous with about
+    10 seconds of buffering, or finite when numSamp is given. channels is an optional channel list
+    which must hold numChan channels. Configuring again replaces the previous channels.
+    '''
+    def configure(self, numChan, sampFreq, numSamp=None, channels=None):
+        import nidaqmx
+        from nidaqmx.constants import AcquisitionType, TerminalConfiguration
+        from nidaqmx.stream_readers import AnalogMultiChannelReader
+
+        self._closeTasks()
+        checkChannels(numChan, channels)
+        if channels is None:
+            #DAQ is not recognized by system (i.e. not plugged in)
+            try:
+                devName = nidaqmx.system.System.local().devices[0].name
+            except IndexError as err:
+                raise DAQError('System cannot find DAQ, ensure device is plugged in') from err
+            channels = devName + '/ai0:' + str(numChan - 1)
+
+        if numSamp is None:
+            mode, bufferSize = AcquisitionType.CONTINUOUS, sampFreq * 10
+        else:
+            mode, bufferSize = AcquisitionType.FINITE, numSamp
+
+        groups = parseChannels(channels)
+        master = groups[0][0]
+        first = 0
+        for devName, physicalChannels, count in groups:
+            task = nidaqmx.Task()
+            self.tasks.append(task)
+
+            #Set up device and channels, check for errors
+            try:
+                task.ai_channels.add_ai_voltage_chan(physicalChannels, terminal_config=TerminalConfiguration.RSE)
+            #Channel number exceeds device range, or device does not exist
+            except nidaqmx.errors.DaqError as err:
+                raise DAQError('Ensure channels ' + physicalChannels + ' are within device range.') from err
+
+            #Other devices sample on the master's clock edges and start with it
+            try:
+                if devName == master:
+                    task.timing.cfg_samp_clk_timing(rate=sampFreq, sample_mode=mode, samps_per_chan=bufferSize)
+                else:
+                    task.timing.cfg_samp_clk_timing(rate=sampFreq, source='/' + master + '/ai/SampleClock',
+                                                    sample_mode=mode, samps_per_chan=bufferSize)
+                    task.triggers.start_trigger.cfg_dig_edge_start_trig('/' + master + '/ai/StartTrigger')
+            except nidaqmx.errors.DaqError as err:
+                raise DAQError('Cannot share the sample clock of ' + master + ' with ' + devName + ': ' + str(err)) from err
+
+            self.readers.append(AnalogMultiChannelReader(task.in_stream))
+            self.rows.append((first, first + count))
+            first += count
+
+        if len(self.tasks) > 1:
+            self.pool = ThreadPoolExecutor(max_workers=len(self.tasks), thread_name_prefix='NIDevice')
+        self.numChan = numChan
+        self.sampFreq = sampFreq
+
+    '''
+    Starts every task. The master goes last, since the others wait for its start trigger.
+    '''
+    def start(self):
+        for task in reversed(self.tasks):
+            task.start()
+
+    '''
+    Fills a (numChan, n) float64 block with the next n samples of every channel, waiting for them if needed
+    '''
+    def read(self, block, timeout=10.0):
+        if self.pool is None:
+            self._readRows(0, block, timeout)
+            return
+
+        #Devices are read at the same time, each into its own rows, and every read is waited for
+        futures = [self.pool.submit(self._readRows, num, block, timeout) for num in range(len(self.readers))]
+        errors = [future.exception() for future in futures]
+        for err in errors:
+            if err is not None:
+                raise err
+
+    def _readRows(self, num, block, timeout):
+        import nidaqmx
+        first, last = self.rows[num]
+        try:
+            #Rows of a C-ordered block are contiguous, so the reader can fill them in place
+            self.readers[num].read_many_sample(block[first:last], number_of_samples_per_channel=block.shape[1],
+                                               timeout=timeout)
+        except nidaqmx.errors.DaqError as err:
+            #-200279: samples were overwritten before they could be read
+            if err.error_code == -200279:
+                raise DAQOverrun(str(err)) from err
+            raise DAQError(str(err)) from err
+
+    '''
+    Returns the number of samples per channel acquired but not yet read by every device
+    '''
+    def backlog(self):
+        return min(task.in_stream.avail_samp_per_chan for task in self.tasks)
+
+    def stop(self):
+        for task in self.tasks:
+            task.stop()
+
+    def close(self):
+        self._closeTasks()
+
+    def _closeTasks(self):
+        for task in self.tasks:
+            task.close()
+        if self.pool is not None:
+            self.pool.shutdown()
+        self.tasks = []
+        self.readers = []
+        self.rows = []
+        self.pool = None
+
+
+'''
+Software DAQ. Samples are produced at the configured rate against the wall clock: read() waits until
+the requested samples would have been acquired, and fails with an overflow like a real device if the
+reader falls more than bufferSeconds behind. The signal is synthetic EMG (a 2.5 V offset with noise
+bursts of varying strength on every channel), or a recording replayed in a loop if replayPath is given.
+speed scales the clock (2 produces samples twice as fast as the configured rate); speed=0 produces
+them as fast as they are read, with no waiting and no overflow, for throughput tests.
+'''
+class SimDevice:
+    def __init__(self, replayPath=None, bufferSeconds=10.0, seed=None, speed=1.0):
+        self.replayPath = replayPath
+        self.bufferSeconds = bufferSeconds
+        self.speed = speed
+        self.rng = numpy.random.default_rng(seed)
+        self.replay = None
+        self.numChan = 0
+        self.sampFreq = 0
+        self.numSamp = None
+        self.startTime = None
+        self.position = 0
+        self._stopEvent = threading.Event()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def configure(self, numChan, sampFreq, numSamp=None, channels=None):
+        checkChannels(numChan, channels)
+        if self.replayPath is not None:
+            from SessionFile import loadRecording
+            replay = loadRecording(self.replayPath, mmap=True)
+            if numChan > replay.shape[1]:
+                raise DAQError('Ensure channel number is within device range.')
+            self.replay = replay[:, :numChan]
+
+        self.numChan = numChan
+        self.sampFreq = sampFreq
+        self.numSamp = numSamp
+
+    def start(self):
+        self._stopEvent.clear()
+        self.position = 0
+        self.startTime = time.perf_counter()
+
+    '''
+    Fills a (numChan, n) block with the next n samples of every channel, waiting for them if needed
+    '''
+    def read(self, block, timeout=10.0):
+        count = block.shape[1]
+        end = self.position + count
+        if self.numSamp is not None and end > self.numSamp:
+            raise DAQError('Requested samples beyond the end of a finite acquisition.')
+
+        if self._stopEvent.is_set():
+            raise DAQError('Acquisition stopped during read.')
+        if self.speed > 0:
+            #Wait until the device clock has produced the requested samples
+            wait = self.startTime + end / (self.sampFreq * self.speed) - time.perf_counter()
+            if wait > timeout:
+                raise DAQError('Read timed out before the requested samples were acquired.')
+            if wait > 0 and self._stopEvent.wait(wait):
+                raise DAQError('Acquisition stopped during read.')
+
+            #Reader is further behind than the device buffer can hold
+            if self.backlog() > self.bufferSeconds * self.sampFreq:
+                raise DAQOverrun('Buffer overflow: samples were not read fast enough.')
+
+        if self.replay is not None:
+            indices = numpy.arange(self.position, end) % len(self.replay)
+            block[:] = self.replay[indices].T
+        else:
+            self._synthesize(block)
+        self.position = end
+
+    '''
+    Returns the number of samples per channel acquired but not yet read
+    '''
+    def backlog(self):
+        if self.speed == 0:
+            return 0
+        return max(0, int((time.perf_counter() - self.startTime) * self.sampFreq * self.speed) - self.position)
+
+    def _synthesize(self, block):
+        #Muscle activity envelope per channel, bursting on and off about once a second
+        times = (self.position + numpy.arange(block.shape[1])) / self.sampFreq
+        phases = numpy.arange(self.numChan)[:, None] * 0.7
+        envelope = 0.05 + 0.45 * numpy.clip(numpy.sin(2 * numpy.pi * 0.5 * times + phases), 0, None)
+        block[:] = 2.5 + envelope * self.rng.standard_normal(block.shape)
+
+    def stop(self):
+        self._stopEvent.set()
+
+    def close(self):
+        self.stop()
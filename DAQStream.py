@@ -0,0 +1,144 @@
+import queue
+import threading
+import time
+import numpy
+from DAQDevice import DAQError, DAQOverrun
+from SessionHealth import TimingMonitor
+
+'''
+Date: October, 2026
+Summary: Background acquisition engine for continuous and long finite recordings. A dedicated thread reads
+fixed-size blocks from the device into a pool of preallocated arrays and hands the filled blocks
+to the GUI through a queue, so the sample rate is set by the DAQ clock rather than the Tk event loop.
+'''
+
+
+'''
+Continuous block reader for an already configured device (see DAQDevice). Each block is a
+(numChan, blockSize) float64 array, matching the layout read_many_sample expects; blockSize must be at
+least 1 (ValueError otherwise). Blocks taken off the queue with getBlocks() should be handed back with
+release() once the caller is done with them so the pool can be reused.
+If numSamp is given the stream ends by itself after that many samples per channel
+(the last block may be shorter), otherwise it runs until stop() is called.
+Block timing, backlog and overruns are recorded in the monitor attribute (see SessionHealth).
+With backpressure set the reader waits for a released block instead of growing the pool, which
+keeps memory bounded for sources that can be paused (e.g. replay as fast as possible).
+'''
+class DAQStream:
+    def __init__(self, device, blockSize, poolSize=16, timeout=10.0, numSamp=None, backpressure=False):
+        if blockSize < 1:
+            raise ValueError('Block size must be at least 1 sample, got ' + str(blockSize))
+        self.device = device
+        self.numChan = device.numChan
+        self.blockSize = blockSize
+        self.timeout = timeout
+        self.numSamp = numSamp
+        self.backpressure = backpressure
+        self.numRead = 0
+
+        #Filled blocks waiting for the GUI, and empty blocks waiting for the reader
+        self.filled = queue.Queue()
+        self.free = queue.Queue()
+        for _ in range(poolSize):
+            self.free.put(numpy.zeros((self.numChan, blockSize), dtype=numpy.float64))
+
+        self.error = None
+        self.monitor = TimingMonitor(device.sampFreq)
+        self._stopEvent = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='DAQStream', daemon=True)
+
+    '''
+    Starts the device and the reader thread
+    '''
+    def start(self):
+        self.device.start()
+        self._thread.start()
+
+    '''
+    Signals the reader thread to finish its current block, waits for it, then stops the device
+    '''
+    def stop(self):
+        self._stopEvent.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.device.stop()
+
+    '''
+    Returns every block read since the last call, waiting up to timeout seconds for the first one if
+    a timeout is given (no waiting by default). A None entry marks the end of the stream (reader
+    stopped or failed, see the error attribute). With withTimes set, every block comes as a
+    (block, acquiredTime) pair, acquiredTime being the perf_counter time its last sample was acquired.
+    '''
+    def getBlocks(self, timeout=None, withTimes=False):
+        entries = []
+        if timeout is not None:
+            try:
+                entries.append(self.filled.get(timeout=timeout))
+            except queue.Empty:
+                return entries
+        while True:
+            try:
+                entries.append(self.filled.get_nowait())
+            except queue.Empty:
+                break
+        if withTimes:
+            return entries
+        return [None if entry is None else entry[0] for entry in entries]
+
+    '''
+    Returns a block to the pool of preallocated buffers
+    '''
+    def release(self, block):
+        if block is not None:
+            self.free.put(block)
+
+    '''
+    Returns True once a finite stream has read all of its samples
+    '''
+    def finished(self):
+        return self.numSamp is not None and self.numRead >= self.numSamp
+
+    def _run(self):
+        while not self._stopEvent.is_set() and not self.finished():
+            #Consumer has fallen behind and holds every buffer, grow the pool instead of stalling the DAQ
+            try:
+                block = self.free.get_nowait()
+            except queue.Empty:
+                if self.backpressure:
+                    block = self._waitForBlock()
+                    if block is None:
+                        break
+                else:
+                    block = numpy.zeros((self.numChan, self.blockSize), dtype=numpy.float64)
+                    self.monitor.poolMisses += 1
+
+            #Final block of a finite stream, readers need a contiguous array of exactly the remaining size
+            if self.numSamp is not None and self.numSamp - self.numRead < self.blockSize:
+                block = numpy.zeros((self.numChan, self.numSamp - self.numRead), dtype=numpy.float64)
+
+            try:
+                self.device.read(block, timeout=self.timeout)
+            except DAQError as err:
+                if isinstance(err, DAQOverrun):
+                    self.monitor.overruns += 1
+                if not self._stopEvent.is_set():
+                    self.error = err
+                break
+
+            readTime = time.perf_counter()
+            backlog = self.device.backlog()
+            self.monitor.record(block.shape[1], readTime, backlog)
+            self.numRead += block.shape[1]
+            #Samples still waiting in the device buffer were acquired after this block's last sample
+            self.filled.put((block, readTime - backlog / self.device.sampFreq))
+
+        #Sentinel so the consumer knows no more blocks are coming
+        self.filled.put(None)
+
+    def _waitForBlock(self):
+        while not self._stopEvent.is_set():
+            try:
+                return self.free.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        return None
@@ -0,0 +1,146 @@
+import argparse
+
+'''
+Date: October, 2026
+Summary: Command line entry point for running DataGetter without the interfaces, e.g. on headless machines
+or from batch jobs. Each command imports only the modules it needs when it runs, so start-up does not pay
+for Tk, matplotlib, scipy or the DAQ driver unless the command uses them.
+    python DataGetter.py record session.dgs --channels 8 --rate 1000 --seconds 60
+    python DataGetter.py convert GestureData
+    python DataGetter.py preprocess GestureData -o features.txt
+    python DataGetter.py replay session.txt --rate 1000 --filter --model model.pkl
+Run from the repository root. Use --help on any command for its options.
+'''
+
+
+def recordCommand(args):
+    from DAQDevice import DAQError, countChannels
+    from Recorder import record
+
+    try:
+        numChan = countChannels(args.channel_list) if args.channel_list else args.channels
+        if numChan is None:
+            raise SystemExit('record: give --channels or --channel-list')
+        numSamp = None if args.seconds is None else int(args.seconds * args.rate)
+
+        conditioner = None
+        if args.filter or args.envelope or args.rms is not None:
+            from Conditioning import emgPipeline
+            conditioner = emgPipeline(numChan, args.rate, envelope=args.envelope, rmsMs=args.rms)
+
+        if numSamp is None:
+            print('Recording until interrupted (Ctrl+C)')
+        health = record(args.output, numChan, args.rate, numSamp, channels=args.channel_list, kind=args.device,
+                        conditioner=conditioner)
+    except (DAQError, ValueError) as err:
+        raise SystemExit('record: ' + str(err))
+    print('Session health: ' + str(health))
+
+
+def convertCommand(args):
+    from GDProcessor.GDLoader import convertTree
+
+    converted = convertTree(args.directory, args.out)
+    print('Converted ' + str(len(converted)) + ' trial files')
+
+
+def preprocessCommand(args):
+    from GDProcessor.GDPreprocessor import preprocess
+
+    try:
+        totalData = preprocess(args.directory, args.output, workers=args.workers, useThreads=args.threads,
+                               names=args.features, window=args.window, hop=args.hop, useCache=not args.no_cache,
+                               rebuildCache=args.rebuild_cache, fractions=args.split, bySubject=args.by_subject,
+                               seed=args.seed, storePath=args.store, storeRate=args.rate, profile=args.profile,
+                               profilePath=args.profile_dump, profileMemory=args.profile_memory)
+    except ValueError as err:
+        raise SystemExit('preprocess: ' + str(err))
+    print('Final data array shape:\n' + str(totalData.shape))
+
+
+def replayCommand(args):
+    from Replay import compareSnapshot, printStats, replaySession, saveSnapshot
+
+    settings = None
+    if args.model:
+        from OnlineRecognizer import loadModel
+        settings = loadModel(args.model)
+
+    try:
+        output, positions, predictions, stats = replaySession(args.session, args.rate, args.speed, args.block,
+                                                              args.filter, args.envelope, settings, args.rms)
+    except ValueError as err:
+        raise SystemExit('replay: ' + str(err))
+    printStats(stats)
+    if args.compare:
+        print('Compared with ' + args.compare + ': ' + str(compareSnapshot(args.compare, output, positions,
+                                                                           predictions)))
+    if args.save:
+        saveSnapshot(args.save, output, positions, predictions)
+
+
+def buildParser():
+    parser = argparse.ArgumentParser(prog='DataGetter', description='Headless EMG acquisition and preprocessing')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    recordParser = commands.add_parser('record', help='record a session to a .dgs, .npy or .txt file')
+    recordParser.add_argument('output', help='output file, format picked by the extension')
+    recordParser.add_argument('--channels', type=int, help='number of channels (ai0 to ai(N-1) of the first device)')
+    recordParser.add_argument('--channel-list', help='channel list, e.g. Dev1/ai0:3,Dev2/ai0:7, '
+                                                          'with the channels of each device together')
+    recordParser.add_argument('--rate', type=int, required=True, help='sample frequency (Hz)')
+    recordParser.add_argument('--seconds', type=float, help='duration, records until Ctrl+C if not given')
+    recordParser.add_argument('--device', help="backend: 'ni', 'sim' or a recording to replay "
+                                               "(default DATAGETTER_DEVICE, or 'ni')")
+    recordParser.add_argument('--filter', action='store_true', help='band-pass and notch filter before storing')
+    recordParser.add_argument('--envelope', action='store_true', help='store the linear envelope')
+    recordParser.add_argument('--rms', type=float, metavar='MS', help='store the moving RMS over MS milliseconds')
+    recordParser.set_defaults(func=recordCommand)
+
+    convertParser = commands.add_parser('convert', help='convert .txt trial files to binary .npy')
+    convertParser.add_argument('directory', help='GestureData directory')
+    convertParser.add_argument('--out', help='output directory (default: convert in place)')
+    convertParser.set_defaults(func=convertCommand)
+
+    preprocessParser = commands.add_parser('preprocess', help='compile trial features into a data set')
+    preprocessParser.add_argument('directory', help='GestureData directory')
+    preprocessParser.add_argument('-o', '--output', default='GDProcess(Untitled)', help='output .txt (or .npy) file')
+    preprocessParser.add_argument('--workers', type=int, help='worker processes (default: all cores)')
+    preprocessParser.add_argument('--threads', action='store_true', help='use threads instead of processes')
+    preprocessParser.add_argument('--features', nargs='+', default=['std', 'rms'], help='features to compute')
+    preprocessParser.add_argument('--window', type=int, help='window length in samples (default: whole trial)')
+    preprocessParser.add_argument('--hop', type=int, help='hop in samples (default: window length)')
+    preprocessParser.add_argument('--no-cache', action='store_true', help='do not use the feature cache')
+    preprocessParser.add_argument('--rebuild-cache', action='store_true', help='process every trial again')
+    preprocessParser.add_argument('--split', type=float, nargs=3, default=[0.8, 0.1, 0.1],
+                                  help='train, validation and test fractions')
+    preprocessParser.add_argument('--by-subject', action='store_true', help="keep each subject's trials in one part")
+    preprocessParser.add_argument('--seed', type=int, help='random seed for the split')
+    preprocessParser.add_argument('--store', help='also consolidate the raw trials into a store directory')
+    preprocessParser.add_argument('--rate', type=float, default=0.0,
+                                  help='sample frequency (Hz) stored for trials that do not record one')
+    preprocessParser.add_argument('--profile', action='store_true', help='print a per-stage timing table')
+    preprocessParser.add_argument('--profile-dump', help='also write a cProfile dump of the run to this file')
+    preprocessParser.add_argument('--profile-memory', action='store_true',
+                                  help='also trace peak memory per stage (slows the run down)')
+    preprocessParser.set_defaults(func=preprocessCommand)
+
+    replayParser = commands.add_parser('replay', help='replay a session through the streaming pipeline')
+    replayParser.add_argument('session', help='recording to replay (.txt, .npy or session file)')
+    replayParser.add_argument('--rate', type=int, help='sample frequency (Hz), read from session files')
+    replayParser.add_argument('--speed', type=float, default=0, help='speed factor, 0 for as fast as possible')
+    replayParser.add_argument('--block', type=int, help='block size in samples (default: 50 ms of data)')
+    replayParser.add_argument('--filter', action='store_true', help='band-pass and notch filter')
+    replayParser.add_argument('--envelope', action='store_true', help='linear envelope')
+    replayParser.add_argument('--rms', type=float, metavar='MS', help='moving RMS over MS milliseconds')
+    replayParser.add_argument('--model', help='model saved with OnlineRecognizer.saveModel')
+    replayParser.add_argument('--save', help='save output and predictions as a snapshot (.npz)')
+    replayParser.add_argument('--compare', help='compare output and predictions with a snapshot')
+    replayParser.set_defaults(func=replayCommand)
+
+    return parser
+
+
+if __name__ == '__main__':
+    arguments = buildParser().parse_args()
+    arguments.func(arguments)
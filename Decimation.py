@@ -0,0 +1,142 @@
+import numpy
+from SampleBuffer import RingBuffer
+
+'''
+Date: October, 2026
+Summary: Min/max decimation for plotting. Reducing each bin of samples to its minimum and maximum keeps
+every spike visible while bounding the number of points handed to matplotlib, so drawing cost depends
+on the plot width rather than on the sample rate or the length of the recording.
+'''
+
+
+'''
+Helper function that interleaves per-bin minimums and maximums (numChan, numBins) into a single
+(numChan, 2 * numBins) envelope that can be drawn as one line per channel
+'''
+def interleave(mins, maxs):
+    return numpy.stack((mins, maxs), axis=2).reshape(mins.shape[0], -1)
+
+
+'''
+Running min/max envelope of the most recent numBins bins of binSize samples. Blocks are reduced as they
+arrive, with any incomplete bin carried over to the next block, so appending costs O(block length) and
+reading the envelope costs O(numBins) however high the sample rate is.
+'''
+class EnvelopeRing:
+    def __init__(self, numChan, binSize, numBins):
+        self.numChan = numChan
+        self.binSize = binSize
+        self.mins = RingBuffer(numChan, numBins)
+        self.maxs = RingBuffer(numChan, numBins)
+        self.partial = numpy.empty((numChan, binSize))
+        self.fill = 0
+
+    '''
+    Adds a (numChan, n) block of samples
+    '''
+    def append(self, block):
+        numNew = block.shape[1]
+        start = 0
+
+        #Complete the bin left over from the previous block first
+        if self.fill > 0:
+            start = min(self.binSize - self.fill, numNew)
+            self.partial[:, self.fill:self.fill + start] = block[:, :start]
+            self.fill += start
+            if self.fill < self.binSize:
+                return
+            self.mins.append(self.partial.min(axis=1, keepdims=True))
+            self.maxs.append(self.partial.max(axis=1, keepdims=True))
+            self.fill = 0
+
+        #Reduce all whole bins of the block at once
+        numBins = (numNew - start) // self.binSize
+        if numBins > 0:
+            bins = block[:, start:start + numBins * self.binSize].reshape(self.numChan, numBins, self.binSize)
+            self.mins.append(bins.min(axis=2))
+            self.maxs.append(bins.max(axis=2))
+            start += numBins * self.binSize
+
+        #Keep the remainder for the next block
+        self.fill = numNew - start
+        self.partial[:, :self.fill] = block[:, start:]
+
+    '''
+    Returns the bins in time order as (mins, maxs), each (numChan, numFilledBins)
+    '''
+    def envelope(self):
+        return self.mins.latest(), self.maxs.latest()
+
+
+'''
+Multi-resolution min/max pyramid of a whole recording (numSamp, numChan), e.g. a memmap of a session
+file. Each level reduces the one below by factor, so building it reads the recording once and the
+pyramid takes about 2 / (factor - 1) of the recording's size. query() then returns at most about
+maxPoints points per channel for any sample range by picking the finest level that fits.
+'''
+class MinMaxPyramid:
+    def __init__(self, data, factor=8, minBins=1000, chunkSize=2 ** 20):
+        self.data = data
+        self.numSamp = data.shape[0]
+        self.factor = factor
+        self.levels = []
+
+        #First level straight from the samples, read in chunks so memmapped recordings stay on disk
+        chunkSize -= chunkSize % factor
+        mins = []
+        maxs = []
+        for start in range(0, self.numSamp, chunkSize):
+            chunk = numpy.asarray(data[start:start + chunkSize])
+            edges = numpy.arange(0, len(chunk), factor)
+            mins.append(numpy.minimum.reduceat(chunk, edges, axis=0))
+            maxs.append(numpy.maximum.reduceat(chunk, edges, axis=0))
+        if not mins:
+            return
+        binSize = factor
+        self.levels.append((binSize, numpy.concatenate(mins), numpy.concatenate(maxs)))
+
+        #Coarser levels from the previous one until the whole recording fits in minBins bins
+        while len(self.levels[-1][1]) > minBins:
+            _, prevMins, prevMaxs = self.levels[-1]
+            edges = numpy.arange(0, len(prevMins), factor)
+            binSize *= factor
+            self.levels.append((binSize, numpy.minimum.reduceat(prevMins, edges, axis=0),
+                                numpy.maximum.reduceat(prevMaxs, edges, axis=0)))
+
+    '''
+    Returns (sampleIndices, values) covering samples start to stop with at most about maxPoints points,
+    values being (numPoints, numChan). Raw samples are returned when the range is small enough, otherwise
+    each bin contributes its minimum and maximum.
+    '''
+    def query(self, start, stop, maxPoints=4000):
+        start = max(0, int(start))
+        stop = min(self.numSamp, int(stop))
+        if stop <= start:
+            return numpy.zeros(0), numpy.zeros((0, self.data.shape[1]))
+        if stop - start <= maxPoints or not self.levels:
+            return numpy.arange(start, stop), numpy.asarray(self.data[start:stop])
+
+        for binSize, mins, maxs in self.levels:
+            if (stop - start) / binSize <= maxPoints / 2:
+                break
+        first = start // binSize
+        last = -(-stop // binSize)
+        sampleIndices = numpy.repeat(numpy.arange(first, last) * binSize + binSize // 2, 2)
+        values = numpy.stack((mins[first:last], maxs[first:last]), axis=1).reshape(-1, mins.shape[1])
+        return sampleIndices, values
+
+
+'''
+Keeps the lines of a multi-channel plot (one line per channel, axes sharing their x-axis in seconds)
+at the right level of detail: whenever the visible time range changes the pyramid is queried again and
+the lines are replaced by at most about maxPoints points each.
+'''
+def linkPyramid(axes, lines, pyramid, sampFreq, maxPoints=4000):
+    def onXlimChanged(ax):
+        low, high = ax.get_xlim()
+        sampleIndices, values = pyramid.query(low * sampFreq - 1, high * sampFreq + 2, maxPoints)
+        for position, line in enumerate(lines):
+            line.set_data(sampleIndices / sampFreq, values[:, position])
+        ax.figure.canvas.draw_idle()
+
+    axes[0].callbacks.connect('xlim_changed', onXlimChanged)
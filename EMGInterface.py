@@ -1,14 +1,19 @@
+import atexit
+import os
+import tempfile
 import tkinter
 from tkinter import *
+from tkinter import ttk
 #from PIL import ImageTk, Image
 from tkinter import messagebox
 from tkinter.filedialog import asksaveasfilename
 import numpy
-import nidaqmx
-import nidaqmx.system._collections.device_collection as device
-from nidaqmx.constants import Edge
-from nidaqmx.stream_readers import AnalogMultiChannelReader
 import matplotlib.pyplot as plt
+from DAQDevice import DAQError, openDevice, readChannelList
+from DAQStream import DAQStream
+from Decimation import MinMaxPyramid, linkPyramid
+from SessionFile import SESSION_EXT, SessionWriter, openSession, saveSession
+from SessionHealth import checkHealth
 
 '''
 Author(s): Created by Elijah Brown under the supervision of Dr. Kim
@@ -24,6 +29,18 @@ root.title('EMG Interface')
 root.iconbitmap('cbu-icon.ico')
 root.config(bg='light gray')
 
+#Recordings larger than this (in bytes) are spilled to a temporary session file instead of memory
+SPILL_BYTES = 2 ** 30
+
+#State of the recording in progress
+daqDevice = None
+stream = None
+valuesRead = None
+writer = None
+numRead = 0
+#Spill files that could not be deleted yet (still memory-mapped, e.g. by an open plot on Windows)
+pendingSpills = []
+
 #Assign font styles
 frameFont = ('Courier', 15, 'bold')
 labelFont = ('Courier', 12)
@@ -66,6 +83,16 @@ chanNumber = Entry(frame, borderwidth=3, bg='light blue', font=entryFont)
 chanNumber.pack(pady=(0, 10))
 
 
+#Channel list label
+listLabel = Label(frame, text='Channel List (optional, e.g. Dev1/ai0:3,Dev2/ai0:7)\n'
+                              'Columns follow the list, give each device\'s channels together',
+                  bg='light gray', font=labelFont, justify='left')
+listLabel.pack(anchor='w', padx=30)
+#Channel list entry
+channelList = Entry(frame, borderwidth=3, bg='light blue', font=entryFont)
+channelList.pack(pady=(0, 10))
+
+
 #Number label
 numLabel = Label(frame, text='Number of Samples', bg='light gray', font=labelFont)
 numLabel.pack(anchor='w', padx=30)
@@ -89,63 +116,149 @@ consisting the following components:
     samples and frequency
     2. Graph the data for the user to visualize the result
     3. Give the user the option to save the .txt for the data
+The recording is read in chunks on a background thread, so the window stays responsive,
+shows progress, and can be cancelled. Steps 2 and 3 run from finishSession once it ends.
 '''
 def recordSession():
+    global daqDevice, stream, valuesRead, writer, numRead
+    removeSpills()
     #Gain current provided information (uses str to accept anything)
     numChan = chanNumber.get()
     numSamp = sampNumber.get()
     sampFreq = frequency.get()
+    #A channel list (possibly spanning several devices) sets the channel count itself
+    try:
+        channels, numChan = readChannelList(channelList.get(), numChan)
+    except DAQError as err:
+        messagebox.showerror('Invalid Parameters', str(err))
+        return
 
     #Once all parameters are valid, begin recording
     if checkEntry(numChan) and checkEntry(numSamp) and checkEntry(sampFreq):
-        with nidaqmx.Task() as readTask:
-            #Set up device and channels, check for errors
-            try:
-                local_system = nidaqmx.system.System.local()
-                devName = local_system.devices[0].name
-                #devNameList = device.DeviceCollection.device_names.__get__(0)
-                #devName = devNameList[0]
-                readTask.ai_channels.add_ai_voltage_chan(devName + '/ai0:'
-                                                         + str(int(numChan) - 1),
-                                                         terminal_config=nidaqmx.constants.TerminalConfiguration.RSE)
-            #Channel number exceeds device range
-            except nidaqmx.errors.DaqError:
-                messagebox.showerror('DAQ Error', 'Ensure channel number is within device range.')
-                raise
-            #DAQ is not recognized by system (i.e. not plugged in)
-            except IndexError:
-                messagebox.showerror('DAQ Error', 'System cannot find DAQ, ensure device is plugged in')
-                raise
+        numChan = int(numChan)
+        numSamp = int(numSamp)
+        sampFreq = int(sampFreq)
+
+        #Set up device channels and sampling frequency, check for errors
+        #(device range, or DAQ not recognized by system). The device samples continuously
+        #and the stream stops after numSamp samples, so the DAQ buffer stays small
+        daqDevice = openDevice()
+        try:
+            daqDevice.configure(numChan, sampFreq, channels=channels)
+        except DAQError as err:
+            daqDevice.close()
+            messagebox.showerror('DAQ Error', str(err))
+            raise
+
+        #Allocate output with channels as columns, or spill to a session file if it would not fit in memory
+        if numChan * numSamp * 8 > SPILL_BYTES:
+            spillFile, spillPath = tempfile.mkstemp(suffix=SESSION_EXT)
+            os.close(spillFile)
+            writer = SessionWriter(spillPath, numChan, sampFreq, dtype=numpy.float64)
+            valuesRead = None
+        else:
+            writer = None
+            valuesRead = numpy.zeros((numSamp, numChan), dtype=numpy.float64)
+        numRead = 0
+
+        #Record session after successful checks, in chunks of ~100 ms
+        stream = DAQStream(daqDevice, max(1, sampFreq // 10), numSamp=numSamp)
+        stream.start()
+
+        progress['maximum'] = numSamp
+        progress['value'] = 0
+        recordBtn['state'] = DISABLED
+        cancelBtn['state'] = NORMAL
+        root.after(50, pollSession, numChan, numSamp, sampFreq)
+
+
+'''
+Periodically stores the chunks read by the acquisition thread and updates the progress bar,
+until the stream reports that it has ended
+'''
+def pollSession(numChan, numSamp, sampFreq):
+    global numRead
+    for block in stream.getBlocks():
+        if block is None:
+            finishSession(numChan, sampFreq)
+            return
+
+        #Store chunk with channels as columns, then return the buffer to the pool
+        if writer is not None:
+            writer.write(block)
+        else:
+            valuesRead[numRead:numRead + block.shape[1]] = block.T
+        numRead += block.shape[1]
+        stream.release(block)
+
+    progress['value'] = numRead
+    root.after(50, pollSession, numChan, numSamp, sampFreq)
+
+
+'''
+Command function for the cancel button, ends the recording early and keeps the samples read so far
+'''
+def cancelSession():
+    cancelBtn['state'] = DISABLED
+    stream.stop()
 
-            #Record session after successful checks
-            #Set up sampling frequency, number of samples
-            readTask.timing.cfg_samp_clk_timing(rate=int(sampFreq), samps_per_chan=int(numSamp))
 
-            #Create instance of reader
-            reader = AnalogMultiChannelReader(readTask.in_stream)
+'''
+Closes the device once the recording has ended, then plots the data and asks to save it
+'''
+def finishSession(numChan, sampFreq):
+    stream.stop()
+    daqDevice.close()
+    progress['value'] = numRead
+    recordBtn['state'] = NORMAL
+    cancelBtn['state'] = DISABLED
+
+    if stream.error is not None:
+        messagebox.showerror('DAQ Error', str(stream.error))
+    checkHealth(stream.monitor)
+
+    #Spilled recordings are mapped back in from disk, in-memory ones are cut to what was actually read
+    if writer is not None:
+        writer.close()
+        data = openSession(writer.path)[1]
+    else:
+        data = valuesRead[:numRead]
 
-            #Start reading
-            readTask.start()
+    try:
+        if len(data) == 0:
+            return
 
-            #Allocate numpy array based on number of channels and samples
-            valuesRead = numpy.zeros((int(numChan), int(numSamp)), dtype=numpy.float64)
+        #Call plotting function
+        plotChannels(numChan, sampFreq, data)
 
-            #Read analog data, update given array
-            reader.read_many_sample(valuesRead, number_of_samples_per_channel=int(numSamp))
-            readTask.stop()
+        #Ask user for save confirmation (plot still active), health report goes next to the saved file
+        savedFile = askSave(data, sampFreq)
+        if savedFile is not None:
+            stream.monitor.save(savedFile)
+    finally:
+        #The spill file has served its purpose once the user saved or declined
+        if writer is not None:
+            del data
+            pendingSpills.append(writer.path)
+            removeSpills()
 
-            #Transpose array so that channels are columns
-            valuesRead = numpy.transpose(valuesRead)
 
-            #Set up time, x-axis
-            duration = float(numSamp) / int(sampFreq)
-            timeArray = numpy.linspace(0, duration, int(numSamp))
+'''
+Deletes the temporary spill files of past recordings. Files that are still mapped (Windows does not allow
+deleting them while a plot of the recording is open) are retried before the next recording and at exit.
+'''
+def removeSpills():
+    for path in list(pendingSpills):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            continue
+        pendingSpills.remove(path)
 
-            #Call plotting function
-            plotChannels(int(numChan), timeArray, valuesRead)
 
-            #Ask user for save confirmation (plot still active)
-            askSave(valuesRead)
+atexit.register(removeSpills)
 
 
 '''
@@ -170,29 +283,44 @@ def checkEntry(entry):
 
 '''
 Helper function which takes in the necessary information to plot channel output, such as
-the number of channels, time for the x-axis, and 2D matrix for the channel data. The function
-can support up to 6 channels, with any number dynamically resizing to take up the total 
-figure space.
+the number of channels, sampling frequency for the time axis, and 2D matrix for the channel data.
+The function can support up to 6 channels, with any number dynamically resizing to take up the total 
+figure space. Long recordings are drawn from a min/max pyramid, so each view only plots a few
+thousand points per channel and zooming in fetches finer detail.
 '''
-def plotChannels(numChan, xAxis, yAxisMatrix):
+def plotChannels(numChan, sampFreq, yAxisMatrix):
+    #Build level of detail pyramid once, then set up time, x-axis for the full view
+    pyramid = MinMaxPyramid(yAxisMatrix)
+    sampleIndices, yView = pyramid.query(0, len(yAxisMatrix))
+    xAxis = sampleIndices / sampFreq
+    #Channel ranges for the ticks from the coarsest level, so the recording is not read again
+    if pyramid.levels:
+        channelMins, channelMaxs = pyramid.levels[-1][1].min(axis=0), pyramid.levels[-1][2].max(axis=0)
+    else:
+        channelMins, channelMaxs = numpy.min(yAxisMatrix, axis=0), numpy.max(yAxisMatrix, axis=0)
+
     #Set figure and color list for channels
     fig = plt.figure()
     colors = ['green', 'yellow', 'blue', 'red', 'black', 'orange', 'purple', 'purple']
 
     #Plot channels
+    axes = []
+    lines = []
     for position in range(0, numChan):
-        plt.subplot(numChan, 1, position+1)
+        axes.append(plt.subplot(numChan, 1, position+1, sharex=axes[0] if axes else None))
         #Checks to see if EMG spiker shield channels are surpassed, color defaults to purple
         if position > 5:
             colorStr = 'purple'
         else:
             colorStr = colors[position]
-        plt.plot(xAxis, yAxisMatrix[:, position], color=colorStr, label='C.' + str(position))
+        lines.extend(plt.plot(xAxis, yView[:, position], color=colorStr, label='C.' + str(position)))
         plt.legend(loc='upper right', handlelength=0, handletextpad=0, fancybox=True)
         plt.grid()
         plt.margins(y=0.3)
-        plt.yticks([round(numpy.min(yAxisMatrix[:, position], axis=0), 2),
-                    round(numpy.max(yAxisMatrix[:, position], axis=0), 2)])
+        plt.yticks([round(channelMins[position], 2), round(channelMaxs[position], 2)])
+
+    #Re-query the pyramid whenever the visible time range changes
+    linkPyramid(axes, lines, pyramid, sampFreq)
 
     #Set overall labels
     plt.subplots_adjust(hspace=.0)
@@ -203,30 +331,44 @@ def plotChannels(numChan, xAxis, yAxisMatrix):
 
 '''
 Helper function that asks the user for a file name and path via the file dialog,
-saving the generated .txt file from the recorded session
+saving the recorded session as a .txt file, or as a binary session file if that extension is chosen.
+Returns the saved file name, or None if nothing was saved
 '''
-def askSave(data):
+def askSave(data, sampFreq):
     response = messagebox.askyesno('File Save Confirmation', 'Would you like to save the .txt file?\n ' +
                                                              'The data corresponds to the plot shown.')
     #User wants to save file
     if response:
         #Set up dialog
         file = asksaveasfilename(defaultextension='.txt',
-                                 filetypes=[('All Files', '*.*'), ('Text Documents', '*.txt')])
+                                 filetypes=[('All Files', '*.*'), ('Text Documents', '*.txt'),
+                                            ('Session Files', '*' + SESSION_EXT)])
 
         #Handle exception if user exits file dialog
-        if file is None:
-            return
-        
-        #Save text file to specified file
-        numpy.savetxt(file, data, fmt='%.2e')
+        if not file:
+            return None
 
-    else:
-        plt.close('all')
+        #Save binary session file, or text file, to specified file
+        if file.endswith(SESSION_EXT):
+            saveSession(file, data, sampFreq)
+        else:
+            numpy.savetxt(file, data, fmt='%.2e')
+        return file
+
+    plt.close('all')
+    return None
 
 
+#Progress bar for the recording in progress
+progress = ttk.Progressbar(root, orient='horizontal', mode='determinate', length=250)
+progress.pack(padx=10, pady=(5, 0))
+
 #Record Button
 recordBtn = Button(root, text='Record', command=recordSession, font=btnFont)
-recordBtn.pack(pady=15)
+recordBtn.pack(side='left', padx=(20, 0), pady=15)
+
+#Cancel Button
+cancelBtn = Button(root, text='Cancel', command=cancelSession, font=btnFont, fg='red', state=DISABLED)
+cancelBtn.pack(side='right', padx=(0, 20), pady=15)
 
 root.mainloop()
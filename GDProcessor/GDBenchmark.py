@@ -0,0 +1,73 @@
+import os
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+from GDProcessor.GDLoader import findTrials
+from GDProcessor.GDCompiler import compileDataset
+
+'''
+Date: October, 2026
+Summary: Benchmark for parallel feature extraction. Generates a synthetic GestureData tree,
+then times compileDataset with an increasing number of workers in process and thread mode,
+printing the run time and speed-up over the sequential run.
+Run from the repository root with: python -m GDProcessor.GDBenchmark
+'''
+
+
+'''
+Helper function that writes numTrials random trials of numSamp x numChan samples to dirPath
+in the given format ('.txt' or '.npy'), using the gesture/trial naming of the real data
+'''
+def makeTrials(dirPath, numTrials, numSamp, numChan, suffix):
+    rng = np.random.default_rng(0)
+    for num in range(numTrials):
+        subjectDir = Path(dirPath) / ('subject' + str(num // 80))
+        subjectDir.mkdir(parents=True, exist_ok=True)
+        path = subjectDir / ('gesture' + str((num // 10) % 8) + 'trial' + str(num % 10) + '_' + str(num) + suffix)
+        trial = rng.normal(2.5, 0.1, size=(numSamp, numChan))
+        if suffix == '.npy':
+            np.save(path, trial)
+        else:
+            np.savetxt(path, trial, fmt='%.2e')
+
+
+'''
+Times compileDataset over the trials in dirPath for each worker count, returning (workers, seconds) pairs
+'''
+def timeWorkers(dirPath, workerCounts, useThreads):
+    paths = findTrials(dirPath)
+    results = []
+    for workers in workerCounts:
+        startTime = time.perf_counter()
+        compileDataset(paths, workers, useThreads)
+        results.append((workers, time.perf_counter() - startTime))
+    return results
+
+
+def printResults(title, results):
+    print(title)
+    print('  workers    seconds   speed-up')
+    baseTime = results[0][1]
+    for workers, seconds in results:
+        print('  %7d %10.3f %9.2fx' % (workers, seconds, baseTime / seconds))
+
+
+if __name__ == '__main__':
+    numTrials = 320
+    numSamp = 2000
+    numChan = 6
+
+    #Worker counts from sequential up to every core, doubling each step
+    workerCounts = [1]
+    while workerCounts[-1] * 2 <= os.cpu_count():
+        workerCounts.append(workerCounts[-1] * 2)
+    if workerCounts[-1] != os.cpu_count():
+        workerCounts.append(os.cpu_count())
+
+    for suffix in ('.txt', '.npy'):
+        with tempfile.TemporaryDirectory() as tempDir:
+            makeTrials(tempDir, numTrials, numSamp, numChan, suffix)
+            title = str(numTrials) + ' ' + suffix + ' trials of ' + str(numSamp) + ' x ' + str(numChan)
+            printResults(title + ', processes', timeWorkers(tempDir, workerCounts, False))
+            printResults(title + ', threads', timeWorkers(tempDir, workerCounts, True))
@@ -0,0 +1,81 @@
+import os
+import pickle
+from pathlib import Path
+
+'''
+Date: October, 2026
+Summary: Persistent cache of per-trial feature rows, so a preprocessing run only has to featurize
+trials that are new or have changed since the last run. Entries are keyed on the trial's path,
+modification time and size, and the whole cache is dropped when the feature signature changes.
+'''
+
+CACHE_NAME = '.gdcache.pkl'
+
+
+'''
+Feature row cache stored as a pickle file. signature identifies the feature set the rows were
+computed with; a cache written with a different signature is ignored and overwritten on save().
+'''
+class FeatureCache:
+    def __init__(self, cachePath, signature, rebuild=False):
+        self.cachePath = Path(cachePath)
+        self.signature = signature
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.changed = False
+
+        if not rebuild and self.cachePath.exists():
+            try:
+                with open(self.cachePath, 'rb') as file:
+                    stored = pickle.load(file)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                stored = None
+            if stored is not None and stored.get('signature') == signature:
+                self.entries = stored['entries']
+
+    '''
+    Helper function that returns the (mtime, size) stamp used to detect a changed trial file
+    '''
+    @staticmethod
+    def stamp(path):
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    '''
+    Returns the cached row for a trial file, or None if it is missing or out of date
+    '''
+    def get(self, path):
+        entry = self.entries.get(str(path))
+        if entry is not None and entry[0] == self.stamp(path):
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def put(self, path, row):
+        self.entries[str(path)] = (self.stamp(path), row)
+        self.changed = True
+
+    '''
+    Removes entries for files that are no longer part of the dataset
+    '''
+    def prune(self, paths):
+        keep = set(str(path) for path in paths)
+        for key in list(self.entries):
+            if key not in keep:
+                del self.entries[key]
+                self.changed = True
+
+    '''
+    Writes the cache back to disk if anything changed, replacing the old file atomically
+    '''
+    def save(self):
+        if not self.changed:
+            return
+        tempPath = self.cachePath.with_name(self.cachePath.name + '.tmp')
+        with open(tempPath, 'wb') as file:
+            pickle.dump({'signature': self.signature, 'entries': self.entries}, file,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tempPath, self.cachePath)
+        self.changed = False
@@ -0,0 +1,179 @@
+import hashlib
+import inspect
+import os
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+import numpy as np
+from GDProcessor import GDFeatures
+from GDProcessor.GDFeatures import windowFeatures
+from GDProcessor.GDLoader import loadTrial
+
+'''
+Date: October, 2026
+Summary: Per-trial feature extraction for the preprocessor, and a compiler that maps it over
+many trial files either sequentially or on a pool of worker processes/threads. Results always
+come back in the same order as the given paths and are written straight into one preallocated matrix.
+'''
+
+#Features computed for every trial by default, see GDFeatures for the available names
+DEFAULT_FEATURES = ('std', 'rms')
+
+
+'''
+Returns the gesture label encoded in a trial file name (the digit right before 'trial')
+'''
+def gestureLabel(path):
+    path = str(path)
+    gestureInd = path.find('trial') - 1
+    return int(path[gestureInd])
+
+
+'''
+Computes the features of a single trial (channels as columns) into out (allocated if not given),
+one row per window and one block of numChan columns per feature. window=None treats the whole
+trial as one window, giving a single row. If a timings dictionary is given, the seconds spent on mean
+subtraction and on the features are stored in it under 'center' and 'features'.
+'''
+def extractFeatures(trial, names=DEFAULT_FEATURES, window=None, hop=None, out=None, timings=None):
+    startTime = time.perf_counter()
+    #Subtract mean out of raw data
+    trial = trial - np.mean(trial, axis=0)
+    centerTime = time.perf_counter()
+
+    #Conduct feature engineering
+    #TODO: Note - To add another feature, register it in GDFeatures and add its name to names
+    out = windowFeatures(trial, names, window, hop, out=out)
+    if timings is not None:
+        timings['center'] = centerTime - startTime
+        timings['features'] = time.perf_counter() - centerTime
+    return out
+
+
+'''
+Loads a trial file and returns its feature rows (one per window) with the gesture label in the last column.
+With timed set, returns (rows, timing) where timing holds the seconds spent loading, centering and
+computing features and the file size in bytes. If tracemalloc is running in this process it also holds
+the bytes still allocated after the trial ('allocated') and how far the trial raised the traced peak
+('peakRise', 0 if it stayed under an earlier peak); both are None otherwise. See GDProfiler.
+'''
+def trialRows(path, names=DEFAULT_FEATURES, window=None, hop=None, mmap=False, timed=False):
+    timing = {} if timed else None
+    if timed:
+        #The traced peak is left alone, it belongs to the profiler stage around the whole compile
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            startMemory, startPeak = tracemalloc.get_traced_memory()
+        startTime = time.perf_counter()
+
+    trial = loadTrial(path, mmap=mmap)
+    if timed:
+        timing['load'] = time.perf_counter() - startTime
+    numSamp, numChan = trial.shape
+    window = numSamp if window is None else window
+    hop = window if hop is None else hop
+    rows = np.empty((GDFeatures.numWindows(numSamp, window, hop), len(names) * numChan + 1))
+    extractFeatures(trial, names, window, hop, out=rows[:, :-1], timings=timing)
+    rows[:, -1] = gestureLabel(path)
+
+    if not timed:
+        return rows
+    #Only the rows outlive the trial, so count what is left once the samples are released
+    del trial
+    timing['bytes'] = os.path.getsize(path)
+    timing['allocated'] = timing['peakRise'] = None
+    if tracing:
+        memory, peak = tracemalloc.get_traced_memory()
+        timing['allocated'] = memory - startMemory
+        timing['peakRise'] = max(0, peak - startPeak)
+    return rows, timing
+
+
+'''
+Yields the feature rows of every trial file, in the order of paths. With workers > 1 the trials are
+spread over a process pool, or a thread pool if useThreads is set (enough for memory-mapped binary
+trials, where numpy releases the GIL for most of the work). workers=None uses every core.
+'''
+def iterRows(paths, workers=1, useThreads=False, names=DEFAULT_FEATURES, window=None, hop=None, timed=False):
+    if workers is None:
+        workers = os.cpu_count()
+    rowFunc = partial(trialRows, names=names, window=window, hop=hop, mmap=useThreads, timed=timed)
+
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield rowFunc(path)
+        return
+
+    if useThreads:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            yield from pool.map(rowFunc, paths)
+        return
+
+    #Send trials in batches so process start-up and pickling costs are spread out
+    chunkSize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(rowFunc, paths, chunksize=chunkSize)
+
+
+'''
+Returns a string identifying a feature set, used to invalidate cached feature rows. It covers the
+chosen names and window settings plus a hash of the feature code, so editing a feature is enough
+to invalidate the cache.
+'''
+def featureSignature(names=DEFAULT_FEATURES, window=None, hop=None):
+    source = inspect.getsource(GDFeatures) + inspect.getsource(extractFeatures) + inspect.getsource(gestureLabel)
+    return hashlib.sha1(source.encode()).hexdigest() + repr((tuple(names), window, hop))
+
+
+'''
+Compiles the feature rows of all trial files into a single (numRows, numFeatures + 1) matrix with the
+gesture label in the last column, one row per trial (or per window when window is set), in file order.
+The matrix is allocated once the row count is known and each trial's rows are written in place, so
+compile time and memory grow linearly with the number of trials.
+If a FeatureCache is given, only trials missing from it (new or modified files) are featurized.
+withTrials also returns, for every row, the index in paths of the trial it came from.
+If a GDProfiler.Profiler is given, the timing of every featurized trial and the bytes read are added to it.
+'''
+def compileDataset(paths, workers=1, useThreads=False, cache=None, names=DEFAULT_FEATURES, window=None, hop=None,
+                   withTrials=False, profiler=None):
+    paths = list(paths)
+    trialBlocks = [None] * len(paths)
+
+    #Reuse cached rows, and collect the trials that still need processing
+    todo = []
+    for num, path in enumerate(paths):
+        rows = cache.get(path) if cache is not None else None
+        if rows is None:
+            todo.append(num)
+        else:
+            trialBlocks[num] = rows
+
+    timed = profiler is not None and profiler.enabled
+    for num, rows in zip(todo, iterRows([paths[num] for num in todo], workers, useThreads, names, window, hop,
+                                        timed)):
+        if timed:
+            rows, timing = rows
+            profiler.addFile(paths[num], timing)
+            profiler.addBytes('compile', timing['bytes'])
+        trialBlocks[num] = rows
+        if cache is not None:
+            cache.put(paths[num], rows)
+
+    if cache is not None:
+        cache.prune(paths)
+        cache.save()
+
+    if not trialBlocks:
+        totalData = np.zeros((0, 0))
+    else:
+        totalData = np.empty((sum(len(rows) for rows in trialBlocks), trialBlocks[0].shape[1]))
+        start = 0
+        for rows in trialBlocks:
+            totalData[start:start + len(rows)] = rows
+            start += len(rows)
+
+    if withTrials:
+        #Position in paths of the trial every row came from
+        return totalData, np.repeat(np.arange(len(trialBlocks)), [len(rows) for rows in trialBlocks])
+    return totalData
@@ -0,0 +1,132 @@
+import numpy as np
+
+'''
+Date: October, 2026
+Summary: Registry of EMG time-domain features computed over sliding windows. Every feature works on
+a whole trial (samples x channels) at once: per-sample quantities are accumulated with a cumulative
+sum and each window's value is the difference of two prefix sums, so the cost does not depend on the
+window length and there is no Python loop over windows or channels.
+To add a feature, write a function taking (trial, window, hop) that returns a (numWindows, numChan)
+array and decorate it with @registerFeature('name').
+'''
+
+FEATURES = {}
+
+#Shortest window every feature is defined for (slope sign changes need a sample on each side)
+MIN_WINDOW = 3
+
+#Default thresholds (in Volts) used to reject noise in the zero crossing and slope sign change counts
+ZC_THRESHOLD = 0.0
+SSC_THRESHOLD = 0.0
+
+
+'''
+Decorator that adds a feature function to the registry under the given name
+'''
+def registerFeature(name):
+    def register(func):
+        FEATURES[name] = func
+        return func
+    return register
+
+
+'''
+Helper function that returns the number of full windows of the given length and hop in numSamp samples
+'''
+def numWindows(numSamp, window, hop):
+    if numSamp < window:
+        return 0
+    return 1 + (numSamp - window) // hop
+
+
+'''
+Helper function that sums values (samples x channels) over every window. offset shifts the window
+starts and length overrides the window length, for quantities defined between samples (differences).
+'''
+def windowSums(values, window, hop, count, offset=0, length=None):
+    length = window if length is None else length
+    prefix = np.zeros((values.shape[0] + 1, values.shape[1]))
+    np.cumsum(values, axis=0, out=prefix[1:])
+    starts = np.arange(count) * hop + offset
+    return prefix[starts + length] - prefix[starts]
+
+
+@registerFeature('mav')
+def meanAbsoluteValue(trial, window, hop):
+    count = numWindows(len(trial), window, hop)
+    return windowSums(np.abs(trial), window, hop, count) / window
+
+
+@registerFeature('rms')
+def rootMeanSquare(trial, window, hop):
+    count = numWindows(len(trial), window, hop)
+    return np.sqrt(windowSums(trial**2, window, hop, count) / window)
+
+
+@registerFeature('std')
+def standardDeviation(trial, window, hop):
+    count = numWindows(len(trial), window, hop)
+    mean = windowSums(trial, window, hop, count) / window
+    meanSquare = windowSums(trial**2, window, hop, count) / window
+    return np.sqrt(np.maximum(meanSquare - mean**2, 0.0))
+
+
+@registerFeature('wl')
+def waveformLength(trial, window, hop):
+    count = numWindows(len(trial), window, hop)
+    return windowSums(np.abs(np.diff(trial, axis=0)), window, hop, count, length=window - 1)
+
+
+@registerFeature('zc')
+def zeroCrossings(trial, window, hop, threshold=None):
+    threshold = ZC_THRESHOLD if threshold is None else threshold
+    count = numWindows(len(trial), window, hop)
+    crossing = (trial[:-1] * trial[1:] < 0) & (np.abs(trial[:-1] - trial[1:]) >= threshold)
+    return windowSums(crossing, window, hop, count, length=window - 1)
+
+
+@registerFeature('ssc')
+def slopeSignChanges(trial, window, hop, threshold=None):
+    threshold = SSC_THRESHOLD if threshold is None else threshold
+    count = numWindows(len(trial), window, hop)
+    #Interior samples only, so the first value belongs to the second sample of the trial
+    change = (trial[1:-1] - trial[:-2]) * (trial[1:-1] - trial[2:]) > threshold
+    return windowSums(change, window, hop, count, length=window - 2)
+
+
+'''
+Raises ValueError unless every name is a registered feature, window (None for the whole trial) is at
+least MIN_WINDOW samples and hop (None for the window length) is at least 1
+'''
+def checkFeatures(names, window=None, hop=None):
+    unknown = [name for name in names if name not in FEATURES]
+    if unknown:
+        raise ValueError('Unknown feature(s) ' + ', '.join(unknown) + ', choose from ' +
+                         ', '.join(sorted(FEATURES)))
+    if window is not None and window < MIN_WINDOW:
+        raise ValueError('Window must be at least ' + str(MIN_WINDOW) + ' samples, got ' + str(window))
+    if hop is not None and hop < 1:
+        raise ValueError('Hop must be at least 1 sample, got ' + str(hop))
+
+
+'''
+Computes the named features over sliding windows of the trial (samples x channels), returning a
+(numWindows, len(names) * numChan) array with one block of numChan columns per feature, in the order
+of names. window=None uses the whole trial as a single window; hop defaults to the window length.
+Raises ValueError for invalid names, window or hop (see checkFeatures). params maps a feature name to extra keyword arguments (e.g. {'zc': {'threshold': 0.01}}).
+'''
+def windowFeatures(trial, names, window=None, hop=None, params=None, out=None):
+    numSamp, numChan = trial.shape
+    window = numSamp if window is None else window
+    hop = window if hop is None else hop
+    params = {} if params is None else params
+    checkFeatures(names, window, hop)
+
+    count = numWindows(numSamp, window, hop)
+    if out is None:
+        out = np.empty((count, len(names) * numChan))
+
+    for num, name in enumerate(names):
+        out[:, num * numChan:(num + 1) * numChan] = FEATURES[name](trial, window, hop, **params.get(name, {}))
+
+    return out
@@ -0,0 +1,75 @@
+from pathlib import Path
+import numpy as np
+from SessionFile import SESSION_EXT, loadRecording
+
+'''
+Date: October, 2026
+Summary: Loading of gesture trial files for the preprocessor. Trials can be legacy .txt files,
+.npy arrays or binary session files, each holding one trial with channels as columns. Also
+provides a converter that migrates a GestureData tree of .txt trials to .npy.
+Run the converter from the repository root with: python -m GDProcessor.GDLoader
+'''
+
+#Supported trial formats, in order of preference when a trial exists in more than one
+TRIAL_SUFFIXES = ('.npy', SESSION_EXT, '.txt')
+#Files of a consolidated store (see GDStore), whose directory is never searched for trials
+SAMPLES_NAME = 'samples' + SESSION_EXT
+INDEX_NAME = 'index.npy'
+
+
+'''
+Finds every trial file under the given directory. When the same trial exists in several formats
+(e.g. after conversion) only the preferred binary copy is kept. Paths are returned sorted so trials
+are always processed in the same order. Store directories (see GDStore) inside the tree are skipped, so
+a store kept next to the trials is not read back as trials.
+'''
+def findTrials(dirPath):
+    storeDirs = {path.parent for path in Path(dirPath).glob('**/' + INDEX_NAME)
+                 if (path.parent / SAMPLES_NAME).exists()}
+    trials = {}
+    for path in Path(dirPath).glob('**/*'):
+        if path.suffix not in TRIAL_SUFFIXES or storeDirs.intersection(path.parents):
+            continue
+        stem = path.with_suffix('')
+        current = trials.get(stem)
+        if current is None or TRIAL_SUFFIXES.index(path.suffix) < TRIAL_SUFFIXES.index(current.suffix):
+            trials[stem] = path
+
+    return sorted(trials.values())
+
+
+'''
+Loads a single trial as a (numSamp, numChan) array. Binary formats are read without parsing;
+with mmap set, .npy and session files are memory-mapped instead of read into memory.
+'''
+def loadTrial(path, mmap=False):
+    return loadRecording(path, mmap=mmap)
+
+
+'''
+One-shot migration of a GestureData tree from .txt to .npy. Each .txt trial is parsed once and saved
+under outPath (default: next to the original) with the same relative path. Trials whose .npy copy is
+newer than the text file are skipped, so the converter can be rerun after new trials are recorded.
+Returns the list of files written.
+'''
+def convertTree(dirPath, outPath=None):
+    dirPath = Path(dirPath)
+    outPath = dirPath if outPath is None else Path(outPath)
+
+    written = []
+    for path in sorted(dirPath.glob('**/*.txt')):
+        target = (outPath / path.relative_to(dirPath)).with_suffix('.npy')
+        if target.exists() and target.stat().st_mtime >= path.stat().st_mtime:
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        np.save(target, np.loadtxt(path))
+        written.append(target)
+
+    return written
+
+
+if __name__ == '__main__':
+    sourceDir = input('GestureData Directory?\n')
+    targetDir = input('Output Directory? (blank to convert in place)\n')
+    converted = convertTree(sourceDir, targetDir or None)
+    print('Converted ' + str(len(converted)) + ' trial files')
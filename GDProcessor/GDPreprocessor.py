@@ -1,114 +1,139 @@
 from pathlib import Path
 import numpy as np
+from GDProcessor.GDLoader import findTrials
+from GDProcessor.GDCompiler import DEFAULT_FEATURES, compileDataset, featureSignature
+from GDProcessor.GDCache import CACHE_NAME, FeatureCache
+from GDProcessor.GDFeatures import checkFeatures
+from GDProcessor.GDSplit import (NORM_EXT, SPLIT_FRACTIONS, groupSplit, normStats, saveNormStats,
+                                  stratifiedSplit, subjectOf)
+from GDProcessor.GDStore import buildStore
+from GDProcessor.GDProfiler import Profiler
 
 '''
 Author(s): Created by Elijah Brown under the supervision of Dr. Kim
 Date: June, 2022
-Summary: The following program reads through all of the generated .txt files
-found in the given directory, then compiles the data in a single .txt
-file that resembles the desired features values and appropriate labels for
-each gesture
+Summary: The following program reads through all of the generated trial files
+(.txt, or binary .npy/session files) found in the given directory, then compiles the
+data in a single .txt file that resembles the desired features values and appropriate
+labels for each gesture.
+Run from the repository root with: python -m GDProcessor.GDPreprocessor
+or without prompts with: python DataGetter.py preprocess <directory>
 '''
 
 '''
-Helper function that splits the given data into 3 stratified samples:
-1. Training data with 80% of the total samples, and 8 occurrences of each gesture
-2. Validation data with 10% of the total samples, and 1 occurrence of each gesture
-3. Test data with 10% of the total samples, and 1 occurrence of each gesture
+Compiles the features of every trial in dirPath, then splits them into training, validation and test
+rows (fractions, see GDSplit) and normalizes the features with the mean and std of the training rows.
+The split is stratified by gesture with the windows of a trial kept together, or by subject if bySubject
+is set. Rows are returned, and saved to outPath as a tab separated .txt file if given, in the order
+train, validation, test with the label in the last column; the size of each part is printed.
+outPath ending in .npy is saved as a binary array instead. The training mean and std are saved next to it
+as outPath + NORM_EXT (see GDSplit.saveNormStats), and also returned with the rows if withStats is set.
+Raises ValueError if a part would be empty (e.g. fewer subjects than parts with bySubject).
+If storePath is given, the raw samples of every trial are also consolidated into a memory-mapped store
+there (see GDStore), with storeRate as the sample rate of trials whose files do not record one.
+workers and useThreads set the parallel extraction, names/window/hop the features (see GDCompiler),
+and useCache/rebuildCache the feature cache kept in dirPath (see GDCache).
+profile times every stage and trial and prints a summary table at the end (see GDProfiler), and
+profilePath additionally writes a cProfile dump of the run there, and profileMemory adds the peak memory
+of every stage (traced with tracemalloc, which slows the run down).
 '''
-def stratSplit(rawData):
-    # Build the separated and shuffled list of arrays according to gesture number
-    gestureList = []
-    for gesture in range(8):
-        startInd = gesture * 10
-        endInd = startInd + 10
-        gestureList.append(rawData[startInd:endInd, :])
-        #Shuffle trials within a gesture
-        np.random.shuffle(gestureList[gesture])
-
-    stratTest = np.zeros((8, 13))
-    stratVal = np.zeros((8, 13))
-    stratTrain = np.zeros((64, 13))
-
-    for num, array in enumerate(gestureList):
-        stratTest[num, :] = array[0, :]
-
-        stratVal[num, :] = array[1, :]
-
-        startInd = num * 8
-        endInd = startInd + 8
-        stratTrain[startInd:endInd, :] = array[2:, :]
-
-    #Shuffle each of the 3 sets to get rid of sequential ordering
-    np.random.shuffle(stratTrain)
-    np.random.shuffle(stratVal)
-    np.random.shuffle(stratTest)
-
-    #Overall data array begins with Train, then Validate, then Test
-    finalData = np.vstack((stratTrain, stratVal, stratTest))
-
-    #Normalize feature data (labels are left alone)
-    finalX = finalData[:, 0:-1]
-    finalXMean = np.mean(finalX, axis=0)
-    finalXStd = np.mean(finalX, axis=0)
-    finalX = finalX - finalXMean
-    finalX = finalX / finalXStd
-
-    finalData = np.c_[finalX, finalData[:, -1]]
-
-    return finalData
-
-
-#TODO: Must change path to match file location on user's particular system
-#Set up file path variables
-dirPath = 'C:/Users/Elijah Brown/SU2022RA/GestureData'
-paths = Path(dirPath).glob('**/*.txt')
-
-featureList = []
-firstIter = True
-
-#Loop through all gesture data files
-for path in paths:
-    #Load raw data from single trial
-    trial = np.loadtxt(path)
-
-    #Subtract mean out of raw data
-    trial = trial - np.mean(trial, axis=0)
-
-    #Conduct feature engineering
-    #TODO: Note - To add another feature, append new 6 element 1-d array to featureList
-    featureList.append(np.std(trial, axis=0))
-    rms = np.sqrt(np.mean(trial**2, axis=0))
-    featureList.append(rms)
-
-    trialData = featureList[0]
-    for feature in featureList[1:]:
-        trialData = np.hstack((trialData, feature))
-
-    #Add data label based on gesture
-    path = str(path)
-    gestureInd = path.find('trial') - 1
-    gestureNum = int(path[gestureInd])
-    trialData = np.append(trialData, gestureNum)
-
-    #On first iteration, set up empty totalData array to start stack
-    if firstIter:
-        totalData = np.zeros((1, (len(featureList) * 6) + 1))
-        firstIter = False
-
-    #Add new feature array to total data
-    totalData = np.vstack((totalData, trialData))
-
-    #Reset feature list for next trial
-    featureList = []
-
-#Get rid of top blank line, spilt, normalize, and reorder data
-totalData = np.delete(totalData, 0, 0)
-totalData = stratSplit(totalData)
-
-#Save file
-fileName = input("Data File Name?\n")
-if fileName == '':
-    fileName = 'GDProcess(Untitled)'
-np.savetxt(fileName, totalData, fmt='%.6e', delimiter='\t')
-print('Final data array shape:\n' + str(totalData.shape))
+def preprocess(dirPath, outPath=None, workers=None, useThreads=False, names=DEFAULT_FEATURES, window=None,
+               hop=None, useCache=True, rebuildCache=False, fractions=SPLIT_FRACTIONS, bySubject=False, seed=None,
+               storePath=None, profile=False, profilePath=None, profileMemory=False, withStats=False,
+               storeRate=0.0):
+    #Invalid feature settings fail before any trial is read
+    checkFeatures(names, window, hop)
+    profiler = Profiler(enabled=profile or profilePath is not None, traceMemory=profileMemory,
+                        profilePath=profilePath)
+    try:
+        with profiler.stage('find'):
+            paths = findTrials(dirPath)
+        if not paths:
+            raise ValueError('No trial files found in ' + str(dirPath))
+
+        if storePath is not None:
+            with profiler.stage('store', sum(path.stat().st_size for path in paths)):
+                store = buildStore(paths, storePath, storeRate)
+            print('Stored ' + str(len(store)) + ' trials (' + str(len(store.samples)) + ' samples) in ' +
+                  str(storePath))
+
+        with profiler.stage('cache'):
+            cache = FeatureCache(Path(dirPath) / CACHE_NAME, featureSignature(names, window, hop),
+                                 rebuildCache) if useCache else None
+
+        #Extract features from all gesture data files in parallel, rows come back in file order
+        with profiler.stage('compile'):
+            totalData, trialIndex = compileDataset(paths, workers, useThreads, cache, names, window, hop,
+                                                   withTrials=True, profiler=profiler)
+        if cache is not None:
+            print('Cached trials: ' + str(cache.hits) + ', processed trials: ' + str(cache.misses))
+
+        #Split into row indices, statistics come from the training rows only
+        with profiler.stage('split'):
+            if bySubject:
+                subjects = np.array([subjectOf(path) for path in paths])
+                parts = groupSplit(subjects[trialIndex], fractions, seed)
+            else:
+                parts = stratifiedSplit(totalData[:, -1], fractions, trialIndex, seed)
+        print('Split sizes (train, validation, test): ' + str([len(part) for part in parts]))
+
+        #Gather the rows in split order once, then normalize feature data in place (labels are left alone)
+        with profiler.stage('normalize'):
+            mean, std = normStats(totalData[:, :-1], parts[0])
+            totalData = totalData[np.concatenate(parts)]
+            totalData[:, :-1] -= mean
+            totalData[:, :-1] /= std
+
+        with profiler.stage('save'):
+            if outPath is not None and str(outPath).endswith('.npy'):
+                np.save(outPath, totalData)
+            elif outPath is not None:
+                np.savetxt(outPath, totalData, fmt='%.6e', delimiter='\t')
+            if outPath is not None:
+                saveNormStats(str(outPath) + NORM_EXT, mean, std)
+    finally:
+        #Tracing is always stopped, even if a stage failed
+        profiler.finish()
+    if profiler.enabled:
+        profiler.printSummary()
+    if withStats:
+        return totalData, mean, std
+    return totalData
+
+
+if __name__ == '__main__':
+    #TODO: Must change path to match file location on user's particular system
+    #Set up file path variables
+    dirPath = 'C:/Users/Elijah Brown/SU2022RA/GestureData'
+
+    #Number of worker processes for feature extraction (1 = sequential, None = all cores).
+    #Threads are enough when the trials are binary files, since those are memory-mapped
+    numWorkers = None
+    useThreads = False
+
+    #Features to compute (see GDFeatures), and the sliding window/hop in samples.
+    #window = None computes each feature over the whole trial, giving one row per trial
+    featureNames = ('std', 'rms')
+    window = None
+    hop = None
+
+    #Feature rows are cached in the data directory so reruns only process new or changed trials.
+    #Set rebuildCache to force every trial to be processed again
+    useCache = True
+    rebuildCache = False
+
+    #Train, validation and test fractions, and whether to keep each subject's trials in a single part
+    fractions = (0.8, 0.1, 0.1)
+    bySubject = False
+
+    #Print a per-stage timing table at the end of the run
+    profile = False
+
+    #Save file
+    fileName = input("Data File Name?\n")
+    if fileName == '':
+        fileName = 'GDProcess(Untitled)'
+    totalData = preprocess(dirPath, fileName, workers=numWorkers, useThreads=useThreads, names=featureNames,
+                           window=window, hop=hop, useCache=useCache, rebuildCache=rebuildCache,
+                           fractions=fractions, bySubject=bySubject, profile=profile)
+    print('Final data array shape:\n' + str(totalData.shape))
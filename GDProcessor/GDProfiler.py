@@ -0,0 +1,114 @@
+import cProfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+'''
+Date: October, 2026
+Summary: Profiling hooks for the preprocessing pipeline. Each stage of a run (finding trials, compiling
+features, splitting, normalizing, saving, ...) is timed with its bytes read and, optionally, the peak traced
+memory while it ran, and the per-file parts of feature compilation (loading, mean subtraction, feature
+computation) are collected for every trial. A summary table is printed at the end of the run, and the
+whole run can also be recorded with cProfile and dumped for pstats/snakeviz.
+A disabled Profiler costs next to nothing, so the hooks can stay in place.
+'''
+
+#Per-file parts recorded by GDCompiler.trialRows, in pipeline order
+FILE_PARTS = ('load', 'center', 'features')
+
+
+'''
+Collects stage and per-file timings. With traceMemory the peak Python/numpy allocation of every stage is
+recorded with tracemalloc; it is off by default since tracing slows allocation-heavy code down and so
+inflates the timings reported next to it. profilePath enables cProfile for the run; call finish() to stop
+tracing and write the dump.
+'''
+class Profiler:
+    def __init__(self, enabled=True, traceMemory=False, profilePath=None):
+        self.enabled = enabled
+        self.traceMemory = enabled and traceMemory
+        self.profilePath = profilePath
+        #name -> [calls, seconds, bytes, peak bytes], in the order stages first ran
+        self.stages = {}
+        #path -> timing dictionary from trialRows
+        self.files = {}
+        self.profile = None
+
+        if self.traceMemory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if enabled and profilePath is not None:
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+
+    '''
+    Context manager timing one stage. nbytes is the amount of data the stage reads, if known; more can be
+    added while the stage runs with addBytes. Stages with the same name accumulate.
+    '''
+    @contextmanager
+    def stage(self, name, nbytes=0):
+        if not self.enabled:
+            yield
+            return
+        entry = self.stages.setdefault(name, [0, 0.0, 0, 0])
+        entry[2] += nbytes
+        if self.traceMemory:
+            tracemalloc.reset_peak()
+        startTime = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry[0] += 1
+            entry[1] += time.perf_counter() - startTime
+            if self.traceMemory:
+                entry[3] = max(entry[3], tracemalloc.get_traced_memory()[1])
+
+    def addBytes(self, name, nbytes):
+        if self.enabled:
+            self.stages.setdefault(name, [0, 0.0, 0, 0])[2] += nbytes
+
+    '''
+    Records the timing of one trial (see GDCompiler.trialRows)
+    '''
+    def addFile(self, path, timing):
+        if self.enabled:
+            self.files[str(path)] = timing
+
+    '''
+    Stops memory tracing and cProfile, writing the cProfile dump to profilePath
+    '''
+    def finish(self):
+        if self.profile is not None:
+            self.profile.disable()
+            self.profile.dump_stats(self.profilePath)
+            self.profile = None
+        if self.traceMemory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    '''
+    Prints the stage table, the per-file parts summed over every processed trial (CPU time, spread over
+    the workers when compiling in parallel) and the slowest files
+    '''
+    def printSummary(self, slowest=5):
+        total = sum(entry[1] for entry in self.stages.values())
+        print('%-12s %6s %10s %7s %10s %10s' % ('stage', 'calls', 'wall s', '%', 'read MB', 'peak MB'))
+        for name, (calls, seconds, nbytes, peak) in self.stages.items():
+            peak = '%10.1f' % (peak / 2**20) if self.traceMemory else '%10s' % '-'
+            print('%-12s %6d %10.3f %6.1f%% %10.1f %s' % (name, calls, seconds, seconds / max(total, 1e-12) * 100,
+                                                      nbytes / 2**20, peak))
+        print('%-12s %6s %10.3f' % ('total', '', total))
+
+        if not self.files:
+            return
+        timings = list(self.files.values())
+        print('\nPer file (%d trials processed):' % len(timings))
+        for part in FILE_PARTS:
+            seconds = [timing[part] for timing in timings]
+            print('  %-10s total %8.3f s  mean %8.2f ms  max %8.2f ms' % (
+                part, sum(seconds), sum(seconds) / len(seconds) * 1000, max(seconds) * 1000))
+        print('Slowest files:')
+        ranked = sorted(self.files.items(), key=lambda item: -sum(item[1][part] for part in FILE_PARTS))
+        for path, timing in ranked[:slowest]:
+            peak = '' if timing['allocated'] is None else ', net %.1f MB, raised peak %.1f MB' % (
+                timing['allocated'] / 2**20, timing['peakRise'] / 2**20)
+            print('  %8.2f ms  %s (%.1f MB%s)' % (sum(timing[part] for part in FILE_PARTS) * 1000, path,
+                                                 timing['bytes'] / 2**20, peak))
@@ -0,0 +1,185 @@
+from pathlib import Path
+import numpy as np
+
+'''
+Date: October, 2026
+Summary: Train/validation/test splits for compiled feature data. Splits work from label (and group) arrays
+of any size and number of classes, and return arrays of row indices, so no feature rows are copied until
+the caller gathers them. Groups keep related rows together: windows of the same trial (so overlapping
+windows never land on both sides of a split) or every trial of a subject (for subject-independent tests).
+Normalization statistics are computed from the training rows only, in one chunked pass.
+'''
+
+#Default train, validation and test fractions
+SPLIT_FRACTIONS = (0.8, 0.1, 0.1)
+#Suffix of the normalization statistics saved next to a compiled data set
+NORM_EXT = '.norm.npz'
+
+
+'''
+Returns the subject a trial file belongs to, taken as the name of the directory holding it
+'''
+def subjectOf(path):
+    return Path(path).parent.name
+
+
+'''
+Helper function that maps groups to 0..numGroups-1, returning the group of every row and, for every
+group, the label of its first row (labels may be None)
+'''
+def groupLabels(groups, labels=None):
+    _, first, rowGroups = np.unique(groups, return_index=True, return_inverse=True)
+    return rowGroups.ravel(), None if labels is None else np.asarray(labels)[first]
+
+
+'''
+Helper function that returns the rows of the given groups, in the order of the groups
+'''
+def groupRows(rowGroups, chosen):
+    order = np.argsort(rowGroups, kind='stable')
+    starts = np.searchsorted(rowGroups[order], np.arange(rowGroups.max() + 2))
+    return np.concatenate([order[starts[group]:starts[group + 1]] for group in chosen] + [np.zeros(0, int)])
+
+
+'''
+Helper function that splits a shuffled array of units into consecutive parts of the given fractions
+'''
+def cutParts(units, fractions):
+    bounds = np.rint(np.cumsum(fractions) / np.sum(fractions) * len(units)).astype(int)
+    return np.split(units, bounds[:-1])
+
+
+'''
+Helper function that raises a ValueError if a part asked for (fraction above 0) came out empty, e.g. when
+there are fewer groups than parts
+'''
+def checkParts(parts, fractions, numUnits, unitName):
+    for part, fraction in zip(parts, fractions):
+        if fraction > 0 and len(part) == 0:
+            raise ValueError('Cannot split ' + str(numUnits) + ' ' + unitName + ' into parts of ' +
+                             str(tuple(fractions)) + ' without leaving one empty')
+
+
+'''
+Stratified split of the rows into one shuffled index array per fraction, so every class appears in each
+part in about the given proportion. With groups, each group (e.g. the trial of every window row) is kept
+whole and stratified by the label of its first row.
+'''
+def stratifiedSplit(labels, fractions=SPLIT_FRACTIONS, groups=None, seed=None):
+    rng = np.random.default_rng(seed)
+    labels = np.asarray(labels)
+    if groups is None:
+        rowGroups, unitLabels = np.arange(len(labels)), labels
+    else:
+        rowGroups, unitLabels = groupLabels(groups, labels)
+
+    parts = [[] for _ in fractions]
+    for label in np.unique(unitLabels):
+        units = rng.permutation(np.flatnonzero(unitLabels == label))
+        for part, chosen in zip(parts, cutParts(units, fractions)):
+            part.append(chosen)
+
+    indices = []
+    for part in parts:
+        units = rng.permutation(np.concatenate(part))
+        indices.append(units if groups is None else rng.permutation(groupRows(rowGroups, units)))
+    checkParts(indices, fractions, len(unitLabels), 'rows' if groups is None else 'groups')
+    return indices
+
+
+'''
+Splits whole groups (e.g. subjects) into one shuffled index array per fraction, so no group has rows in
+more than one part
+'''
+def groupSplit(groups, fractions=SPLIT_FRACTIONS, seed=None):
+    rng = np.random.default_rng(seed)
+    rowGroups, _ = groupLabels(groups)
+    units = rng.permutation(rowGroups.max() + 1)
+    indices = [rng.permutation(groupRows(rowGroups, chosen)) for chosen in cutParts(units, fractions)]
+    checkParts(indices, fractions, len(units), 'groups')
+    return indices
+
+
+'''
+Stratified k-fold cross validation, returning k (trainIndex, testIndex) pairs in which every unit is tested
+exactly once. With groups, each group is kept whole as in stratifiedSplit.
+'''
+def kFold(labels, k=5, groups=None, seed=None):
+    rng = np.random.default_rng(seed)
+    labels = np.asarray(labels)
+    if groups is None:
+        rowGroups, unitLabels = np.arange(len(labels)), labels
+    else:
+        rowGroups, unitLabels = groupLabels(groups, labels)
+
+    #Deal the shuffled units of every class round the folds, continuing where the previous class stopped
+    unitFold = np.empty(len(unitLabels), dtype=int)
+    offset = 0
+    for label in np.unique(unitLabels):
+        units = rng.permutation(np.flatnonzero(unitLabels == label))
+        unitFold[units] = (offset + np.arange(len(units))) % k
+        offset += len(units)
+
+    rowFold = unitFold[rowGroups]
+    return [(np.flatnonzero(rowFold != fold), np.flatnonzero(rowFold == fold)) for fold in range(k)]
+
+
+'''
+Cross validation over groups (e.g. subjects), returning (trainIndex, testIndex) pairs that each test on
+a different set of whole groups. k=None leaves one group out at a time.
+'''
+def groupKFold(groups, k=None, seed=None):
+    rng = np.random.default_rng(seed)
+    rowGroups, _ = groupLabels(groups)
+    numGroups = rowGroups.max() + 1
+    k = numGroups if k is None else k
+    groupFold = np.empty(numGroups, dtype=int)
+    groupFold[rng.permutation(numGroups)] = np.arange(numGroups) % k
+
+    rowFold = groupFold[rowGroups]
+    return [(np.flatnonzero(rowFold != fold), np.flatnonzero(rowFold == fold)) for fold in range(k)]
+
+
+'''
+Returns the per-column mean and standard deviation of the given rows of features, reading them once in
+chunks of chunkSize rows and merging the chunk statistics. Columns with no spread get a std of 1 so they
+can be normalized without dividing by zero.
+'''
+def normStats(features, index, chunkSize=65536):
+    numCols = features.shape[1]
+    count = 0
+    mean = np.zeros(numCols)
+    sumSquares = np.zeros(numCols)
+    index = np.sort(index)
+    for start in range(0, len(index), chunkSize):
+        chunk = np.asarray(features[index[start:start + chunkSize]], dtype=np.float64)
+        chunkMean = chunk.mean(axis=0)
+        chunkSquares = ((chunk - chunkMean)**2).sum(axis=0)
+
+        #Combine with the statistics so far (Chan et al. parallel variance)
+        total = count + len(chunk)
+        delta = chunkMean - mean
+        mean += delta * len(chunk) / total
+        sumSquares += chunkSquares + delta**2 * count * len(chunk) / total
+        count = total
+
+    std = np.sqrt(sumSquares / max(count, 1))
+    std[std == 0] = 1.0
+    return mean, std
+
+
+'''
+Saves normalization statistics, e.g. next to a compiled data set as outPath + NORM_EXT, so the same
+(features - mean) / std can be applied elsewhere (see OnlineRecognizer.saveModel)
+'''
+def saveNormStats(path, mean, std):
+    with open(path, 'wb') as file:
+        np.savez(file, mean=mean, std=std)
+
+
+'''
+Loads statistics saved with saveNormStats, returning (mean, std)
+'''
+def loadNormStats(path):
+    with np.load(path) as stats:
+        return stats['mean'], stats['std']
@@ -0,0 +1,115 @@
+import os
+import re
+from pathlib import Path
+import numpy as np
+from SessionFile import SESSION_EXT, SessionWriter, openSession, readHeader
+from GDProcessor.GDCompiler import gestureLabel
+from GDProcessor.GDLoader import INDEX_NAME, SAMPLES_NAME, loadTrial
+from GDProcessor.GDSplit import subjectOf
+
+'''
+Date: October, 2026
+Summary: Consolidated gesture dataset store. The raw samples of every trial are concatenated into one
+session file (see SessionFile), opened as a single memmap, next to an index table with one row per trial
+(subject, gesture, trial number, offset, length and sample rate). Trial metadata is parsed from the file
+names once, when the store is built; after that any subset of trials can be selected from the index and
+each trial is a slice of the memmap, without scanning directories or parsing text.
+'''
+
+INDEX_DTYPE = np.dtype([('subject', 'U64'), ('gesture', '<i4'), ('trial', '<i4'), ('offset', '<i8'),
+                        ('length', '<i8'), ('rate', '<f8')])
+
+
+'''
+Returns the trial number encoded in a trial file name (the digits right after 'trial'), or -1 if there are none
+'''
+def trialNumber(path):
+    match = re.search(r'trial(\d+)', Path(path).name)
+    return -1 if match is None else int(match.group(1))
+
+
+'''
+Builds a store in the directory storePath from the given trial files (see GDLoader.findTrials), written
+in the order of paths and stored as dtype (by default the floating point type of the first trial, so
+samples are kept at full precision). Every trial must have the same number of channels. The sample rate
+is read from session files; other formats carry none and get defaultRate (0 if unknown).
+A store already in storePath is replaced only once the new one is complete. Returns the opened GestureStore.
+'''
+def buildStore(paths, storePath, defaultRate=0.0, dtype=None):
+    paths = list(paths)
+    if not paths:
+        raise ValueError('No trials to store')
+    storePath = Path(storePath)
+    storePath.mkdir(parents=True, exist_ok=True)
+
+    #Build into temporary files, so a failed rebuild leaves the previous store as it was
+    samplesPath = storePath / (SAMPLES_NAME + '.tmp')
+    indexPath = storePath / (INDEX_NAME + '.tmp')
+    index = np.zeros(len(paths), dtype=INDEX_DTYPE)
+    offset = 0
+    writer = None
+    try:
+        for num, path in enumerate(paths):
+            trial = loadTrial(path, mmap=True)
+            if writer is None:
+                storeType = np.result_type(trial.dtype, np.float32) if dtype is None else dtype
+                writer = SessionWriter(samplesPath, trial.shape[1], defaultRate, dtype=storeType)
+            elif trial.shape[1] != writer.numChan:
+                raise ValueError(str(path) + ' has ' + str(trial.shape[1]) + ' channels, expected ' +
+                                 str(writer.numChan))
+            writer.write(trial.T)
+
+            rate = readHeader(path)['sampleRate'] if Path(path).suffix == SESSION_EXT else defaultRate
+            index[num] = (subjectOf(path), gestureLabel(path), trialNumber(path), offset, len(trial), rate)
+            offset += len(trial)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    with open(indexPath, 'wb') as file:
+        np.save(file, index)
+
+    #The old index goes first and the new one is moved in last, so samples never sit next to a stale index
+    (storePath / INDEX_NAME).unlink(missing_ok=True)
+    os.replace(samplesPath, storePath / SAMPLES_NAME)
+    os.replace(indexPath, storePath / INDEX_NAME)
+    return GestureStore(storePath)
+
+
+'''
+Read-only view of a store built with buildStore. index is the trial table (a numpy structured array with
+the INDEX_DTYPE fields) and samples the memmap of every trial's samples with channels as columns.
+'''
+class GestureStore:
+    def __init__(self, storePath):
+        self.path = Path(storePath)
+        self.index = np.load(self.path / INDEX_NAME)
+        self.info, self.samples = openSession(self.path / SAMPLES_NAME)
+
+    def __len__(self):
+        return len(self.index)
+
+    '''
+    Returns trial num of the index as a (length, numChan) slice of the memmap
+    '''
+    def trial(self, num):
+        offset, length = self.index['offset'][num], self.index['length'][num]
+        return self.samples[offset:offset + length]
+
+    '''
+    Returns the positions in the index of the trials matching every given field. Each argument can be a
+    single value or a list of accepted values, and None matches everything.
+    '''
+    def select(self, subject=None, gesture=None, trial=None):
+        mask = np.ones(len(self.index), dtype=bool)
+        for field, wanted in (('subject', subject), ('gesture', gesture), ('trial', trial)):
+            if wanted is not None:
+                mask &= np.isin(self.index[field], wanted)
+        return np.flatnonzero(mask)
+
+    '''
+    Yields the trials at the given index positions (all trials if None) in order
+    '''
+    def trials(self, nums=None):
+        for num in range(len(self.index)) if nums is None else nums:
+            yield self.trial(num)
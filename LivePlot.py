@@ -0,0 +1,100 @@
+import time
+import numpy
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from Decimation import EnvelopeRing, interleave
+
+'''
+Date: October, 2026
+Summary: Live scrolling view of a recording in progress. Incoming blocks are reduced to a fixed number of
+min/max bins, and the plot is redrawn with blitting at a capped frame rate, so the cost of the display
+stays the same at any sample rate or session length and the GUI thread stays free for acquisition.
+'''
+
+
+'''
+Scrolling multi-channel envelope plot showing the last `seconds` of data inside the given Tk container.
+Call append() with each acquired (numChan, n) block and refresh() from the GUI loop; refresh() only
+redraws when at least 1 / maxFps seconds have passed since the last frame.
+'''
+class LivePlot:
+    def __init__(self, master, numChan, sampFreq, seconds=5, numBins=1000, maxFps=20):
+        self.numChan = numChan
+        self.maxFps = maxFps
+        self.lastDraw = 0.0
+        self.background = None
+
+        #Bin size chosen so the window holds about numBins bins, but never less than a sample per bin
+        binSize = max(1, int(sampFreq * seconds) // numBins)
+        self.envelope = EnvelopeRing(numChan, binSize, int(sampFreq * seconds) // binSize)
+        self.binSeconds = binSize / sampFreq
+
+        #Set figure and color list for channels
+        self.figure = Figure(figsize=(8, 1.2 * numChan + 1))
+        colors = ['green', 'yellow', 'blue', 'red', 'black', 'orange']
+        self.axes = []
+        self.lines = []
+        for position in range(numChan):
+            ax = self.figure.add_subplot(numChan, 1, position + 1, sharex=self.axes[0] if self.axes else None)
+            #Checks to see if EMG spiker shield channels are surpassed, color defaults to purple
+            colorStr = colors[position] if position <= 5 else 'purple'
+            line, = ax.plot([], [], color=colorStr, linewidth=0.8, animated=True)
+            ax.set_xlim(-seconds, 0)
+            ax.set_ylim(0, 5)
+            ax.set_ylabel('C.' + str(position))
+            ax.grid()
+            self.axes.append(ax)
+            self.lines.append(line)
+        self.figure.supxlabel('Time (s)')
+        self.figure.subplots_adjust(hspace=.0)
+
+        self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+        self.canvas.get_tk_widget().pack(fill='both', expand=True)
+        #Recapture the static background whenever the whole figure is redrawn (e.g. on resize)
+        self.canvas.mpl_connect('draw_event', self._onDraw)
+        self.canvas.draw()
+
+    def append(self, block):
+        self.envelope.append(block)
+
+    '''
+    Redraws the envelope if the frame rate cap allows it
+    '''
+    def refresh(self):
+        now = time.perf_counter()
+        if now - self.lastDraw < 1.0 / self.maxFps or self.background is None:
+            return
+        self.lastDraw = now
+
+        mins, maxs = self.envelope.envelope()
+        numBins = mins.shape[1]
+        if numBins == 0:
+            return
+        xAxis = numpy.repeat((numpy.arange(numBins) - numBins + 1) * self.binSeconds, 2)
+        yAxis = interleave(mins, maxs)
+
+        #Grow the y-axis if the signal leaves it, which needs a full redraw instead of a blit
+        rescale = False
+        for position, ax in enumerate(self.axes):
+            low, high = ax.get_ylim()
+            chanMin, chanMax = mins[position].min(), maxs[position].max()
+            if chanMin < low or chanMax > high:
+                margin = 0.1 * (chanMax - chanMin) + 1e-3
+                ax.set_ylim(min(low, chanMin - margin), max(high, chanMax + margin))
+                rescale = True
+
+        for position, line in enumerate(self.lines):
+            line.set_data(xAxis, yAxis[position])
+        if rescale:
+            self.canvas.draw()
+
+        self.canvas.restore_region(self.background)
+        for ax, line in zip(self.axes, self.lines):
+            ax.draw_artist(line)
+        self.canvas.blit(self.figure.bbox)
+
+    def close(self):
+        self.canvas.get_tk_widget().destroy()
+
+    def _onDraw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
@@ -0,0 +1,126 @@
+import pickle
+import time
+import numpy
+from GDProcessor.GDCompiler import DEFAULT_FEATURES, extractFeatures
+from SampleBuffer import RingBuffer
+
+'''
+Date: October, 2026
+Summary: Real-time gesture recognition on a continuous stream. The most recent window of samples is kept
+in a ring buffer and, every hop, the same features GDPreprocessor computes for a trial are computed for
+the window and passed to a trained classifier. Compute time and sample-to-prediction latency of every
+window are recorded (with the feature part of the compute time separately) and checked against a
+latency budget.
+'''
+
+
+'''
+Saves a trained classifier for online use. model needs a predict(X) method taking a (1, numFeatures)
+array (e.g. a scikit-learn estimator) or can be a plain function of that array. mean and scale are the
+feature normalization used in training, applied as (features - mean) / scale.
+'''
+def saveModel(path, model, names=DEFAULT_FEATURES, window=1000, hop=100, mean=None, scale=None):
+    with open(path, 'wb') as file:
+        pickle.dump({'model': model, 'features': tuple(names), 'window': window, 'hop': hop,
+                     'mean': mean, 'scale': scale}, file)
+
+
+'''
+Loads a model saved with saveModel. A bare pickled classifier is also accepted and gets the default settings.
+'''
+def loadModel(path):
+    with open(path, 'rb') as file:
+        stored = pickle.load(file)
+    if not isinstance(stored, dict):
+        stored = {'model': stored}
+    settings = {'features': DEFAULT_FEATURES, 'window': 1000, 'hop': 100, 'mean': None, 'scale': None}
+    settings.update(stored)
+    return settings
+
+
+'''
+Returns the block size (samples) and GUI poll interval (seconds) for a stream feeding a recognizer, so that
+waiting for a block to fill plus waiting for the next poll takes at most half of the latency budget,
+leaving the other half for features and the classifier
+'''
+def streamTiming(sampFreq, latencyBudget):
+    return max(1, int(sampFreq * latencyBudget / 4)), latencyBudget / 4
+
+
+'''
+Sliding-window classifier fed with (numChan, n) blocks as they are acquired. When more than one hop has
+passed since the last prediction (e.g. after a late block) only the newest window is classified, so the
+latency stays bounded instead of building a backlog; the windows passed over are counted in skipped.
+'''
+class OnlineRecognizer:
+    def __init__(self, numChan, settings, latencyBudget=0.05):
+        self.model = settings['model']
+        self.names = tuple(settings['features'])
+        self.window = settings['window']
+        self.hop = settings['hop']
+        self.mean = settings['mean']
+        self.scale = settings['scale']
+        self.latencyBudget = latencyBudget
+
+        self.ring = RingBuffer(numChan, self.window)
+        self.features = numpy.empty((1, len(self.names) * numChan))
+        self.sinceLast = 0
+        self.prediction = None
+        self.computeTimes = []
+        self.featureTimes = []
+        self.latencies = []
+        self.skipped = 0
+
+    '''
+    Adds a block and classifies the newest window if a hop has passed. arrivalTime is the perf_counter
+    time the block's last sample was acquired (see DAQStream.getBlocks) and is used for the latency;
+    if not given only the time since the block was pushed is counted.
+    Returns the new prediction, or None if no window was classified.
+    '''
+    def push(self, block, arrivalTime=None):
+        if arrivalTime is None:
+            arrivalTime = time.perf_counter()
+        self.ring.append(block)
+        self.sinceLast += block.shape[1]
+        #Nothing is skipped before the first full window
+        if len(self.ring) < self.window:
+            self.sinceLast = min(self.sinceLast, self.hop)
+            return None
+        if self.sinceLast < self.hop:
+            return None
+
+        self.skipped += self.sinceLast // self.hop - 1
+        self.sinceLast %= self.hop
+
+        startTime = time.perf_counter()
+        extractFeatures(self.ring.latest().T, self.names, out=self.features)
+        featureTime = time.perf_counter()
+        features = self.features
+        if self.mean is not None:
+            features = (features - self.mean) / self.scale
+        if hasattr(self.model, 'predict'):
+            self.prediction = self.model.predict(features)[0]
+        else:
+            self.prediction = self.model(features)[0]
+        endTime = time.perf_counter()
+
+        self.computeTimes.append(endTime - startTime)
+        self.featureTimes.append(featureTime - startTime)
+        self.latencies.append(endTime - arrivalTime)
+        return self.prediction
+
+    '''
+    Returns a summary of per-window compute time and latency (in ms) and how many windows exceeded the budget
+    '''
+    def report(self):
+        if not self.latencies:
+            return {'windows': 0, 'skipped': self.skipped}
+        computeMs = numpy.array(self.computeTimes) * 1000
+        latencyMs = numpy.array(self.latencies) * 1000
+        return {'windows': len(latencyMs), 'skipped': self.skipped,
+                'computeP50': float(numpy.percentile(computeMs, 50)),
+                'computeMax': float(computeMs.max()),
+                'latencyP50': float(numpy.percentile(latencyMs, 50)),
+                'latencyP95': float(numpy.percentile(latencyMs, 95)),
+                'latencyMax': float(latencyMs.max()),
+                'overBudget': int(numpy.sum(latencyMs > self.latencyBudget * 1000))}
@@ -0,0 +1,66 @@
+import os
+import time
+import numpy
+from DAQDevice import openDevice
+from DAQStream import DAQStream
+from SessionFile import SESSION_EXT, SessionWriter, openSession
+
+'''
+Date: October, 2026
+Summary: Headless acquisition for scripts and batch jobs. Records from the device backend straight to a
+session file through DAQStream, the same path ConInterface uses when streaming to disk, without importing
+Tk, matplotlib or PIL. Recordings can also be written as .npy or .txt files, which are converted from the
+session file once acquisition has finished. The session health report is saved next to the output.
+'''
+
+
+'''
+Records numSamp samples per channel at sampFreq to path (.dgs, .npy or .txt), or records until
+interrupted (Ctrl+C) if numSamp is None. channels is an optional channel list (see DAQDevice.parseChannels)
+and kind picks the device backend as in openDevice. conditioner, if given, is applied to every block
+before it is stored (see Conditioning). Returns the session health report.
+'''
+def record(path, numChan, sampFreq, numSamp=None, channels=None, kind=None, conditioner=None,
+           pollInterval=0.1):
+    path = str(path)
+    #Other formats are written from a session file next to the output once recording ends
+    sessionPath = path if path.endswith(SESSION_EXT) else path + '.part' + SESSION_EXT
+
+    with openDevice(kind) as device:
+        device.configure(numChan, sampFreq, channels=channels)
+        stream = DAQStream(device, max(1, sampFreq // 10), numSamp=numSamp)
+
+        with SessionWriter(sessionPath, numChan, sampFreq) as writer:
+            stream.start()
+            try:
+                done = False
+                while not done:
+                    time.sleep(pollInterval)
+                    for block in stream.getBlocks():
+                        if block is None:
+                            done = True
+                            continue
+                        writer.write(block if conditioner is None else conditioner.process(block))
+                        stream.release(block)
+            except KeyboardInterrupt:
+                pass
+            finally:
+                stream.stop()
+                #Keep whatever was read before the stream stopped
+                for block in stream.getBlocks():
+                    if block is not None:
+                        writer.write(block if conditioner is None else conditioner.process(block))
+
+    if sessionPath != path:
+        data = openSession(sessionPath)[1]
+        if path.endswith('.npy'):
+            numpy.save(path, data)
+        else:
+            numpy.savetxt(path, data, fmt='%.2e')
+        del data
+        os.remove(sessionPath)
+
+    stream.monitor.save(path)
+    if stream.error is not None:
+        raise stream.error
+    return stream.monitor.report()
@@ -0,0 +1,122 @@
+import time
+from pathlib import Path
+import numpy
+from DAQDevice import SimDevice
+from DAQStream import DAQStream
+from SampleBuffer import ChunkedBuffer
+from SessionFile import SESSION_EXT, loadRecording, readHeader
+
+'''
+Date: October, 2026
+Summary: Headless replay of a saved session (.txt, .npy or session file) through the same streaming path
+as ConInterface: a replaying SimDevice read by DAQStream, the online recognizer on the raw blocks, then
+conditioning and storage. Replay runs in real time, faster, or as fast as possible (speed=0), and the time
+spent in every stage is measured, giving the maximum throughput of conditioning, feature extraction and
+inference on real data. The conditioned output and predictions can be saved as a snapshot and compared
+against one from an earlier revision to regression-test changes to those stages.
+'''
+
+
+'''
+Replays the session at path once, at speed times real time (0 for as fast as possible). sampFreq is read
+from session files and must be given for other formats. filtered/envelope select the conditioning as in
+ConInterface, rmsMs a moving RMS instead of the envelope (see Conditioning.emgPipeline), and settings is
+a model loaded with OnlineRecognizer.loadModel. Returns the conditioned output (numSamp, numChan), the
+sample position and value of every prediction, and the timing statistics.
+'''
+def replaySession(path, sampFreq=None, speed=0, blockSize=None, filtered=False, envelope=False, settings=None,
+                  rmsMs=None):
+    if sampFreq is None:
+        if Path(path).suffix != SESSION_EXT:
+            raise ValueError('The sample frequency of ' + str(path) + ' must be given')
+        sampFreq = int(readHeader(path)['sampleRate'])
+    numSamp, numChan = loadRecording(path, mmap=True).shape
+    blockSize = max(1, sampFreq // 20) if blockSize is None else blockSize
+
+    conditioner = None
+    if filtered or envelope or rmsMs is not None:
+        from Conditioning import emgPipeline
+        conditioner = emgPipeline(numChan, sampFreq, envelope=envelope, rmsMs=rmsMs)
+    recognizer = None
+    if settings is not None:
+        from OnlineRecognizer import OnlineRecognizer
+        recognizer = OnlineRecognizer(numChan, settings)
+
+    device = SimDevice(replayPath=path, speed=speed)
+    device.configure(numChan, sampFreq)
+    #Replay can wait for the pipeline, so blocks are never dropped and the pool never grows
+    stream = DAQStream(device, blockSize, numSamp=numSamp, backpressure=True)
+    output = ChunkedBuffer(numChan, reserve=numSamp)
+    positions = []
+    predictions = []
+    conditionSeconds = 0.0
+
+    startTime = time.perf_counter()
+    stream.start()
+    done = False
+    while not done:
+        for entry in stream.getBlocks(timeout=1.0, withTimes=True):
+            if entry is None:
+                done = True
+                continue
+            block, acquiredTime = entry
+            if recognizer is not None:
+                prediction = recognizer.push(block, acquiredTime)
+                if prediction is not None:
+                    positions.append(len(output) + block.shape[1])
+                    predictions.append(prediction)
+            processed = block
+            if conditioner is not None:
+                processed = conditioner.process(block)
+                conditionSeconds += conditioner.lastSeconds
+            output.append(processed)
+            stream.release(block)
+    elapsed = time.perf_counter() - startTime
+    stream.stop()
+    if stream.error is not None:
+        raise stream.error
+
+    featureSeconds = sum(recognizer.featureTimes) if recognizer is not None else 0.0
+    inferenceSeconds = sum(recognizer.computeTimes) - featureSeconds if recognizer is not None else 0.0
+    stats = {'numSamp': len(output), 'numChan': numChan, 'sampFreq': sampFreq, 'seconds': elapsed,
+             'realTimeFactor': len(output) / sampFreq / elapsed,
+             'conditioningSeconds': conditionSeconds, 'featureSeconds': featureSeconds,
+             'inferenceSeconds': inferenceSeconds, 'windows': len(predictions),
+             'health': stream.monitor.report()}
+    return output.toArray().T, numpy.array(positions, dtype=numpy.int64), numpy.array(predictions), stats
+
+
+'''
+Helper function that prints the throughput of every stage in samples per second (per channel) and as
+a multiple of real time
+'''
+def printStats(stats):
+    print('Replayed %d samples x %d channels in %.3f s (%.1fx real time)' % (
+        stats['numSamp'], stats['numChan'], stats['seconds'], stats['realTimeFactor']))
+    for name in ('conditioning', 'feature', 'inference'):
+        seconds = stats[name + 'Seconds']
+        if seconds > 0:
+            print('  %-12s %8.3f s %14.0f S/s %10.1fx real time' % (
+                name, seconds, stats['numSamp'] / seconds, stats['numSamp'] / stats['sampFreq'] / seconds))
+
+
+'''
+Saves the output and predictions of a replay as a snapshot (.npz)
+'''
+def saveSnapshot(path, output, positions, predictions):
+    numpy.savez(path, output=output, positions=positions, predictions=predictions)
+
+
+'''
+Compares the output and predictions of a replay with a saved snapshot. Returns the largest absolute
+difference of the output and the number of predictions that changed (None where shapes differ).
+'''
+def compareSnapshot(path, output, positions, predictions):
+    with numpy.load(path) as snapshot:
+        maxDiff = None
+        if snapshot['output'].shape == output.shape:
+            maxDiff = float(numpy.max(numpy.abs(snapshot['output'] - output), initial=0.0))
+        changed = None
+        if numpy.array_equal(snapshot['positions'], positions):
+            changed = int(numpy.sum(snapshot['predictions'] != predictions))
+    return {'maxDiff': maxDiff, 'predictionsChanged': changed}
@@ -0,0 +1,133 @@
+import numpy
+
+'''
+Date: October, 2026
+Summary: Sample storage for continuous recordings. ChunkedBuffer keeps a whole session as a list of
+preallocated channel-major chunks, and RingBuffer keeps only the most recent samples for display.
+Both take blocks shaped (numChan, numSamples), as produced by DAQStream.
+'''
+
+#Default size of the chunks a recording grows by
+CHUNK_BYTES = 2 ** 23
+#Largest chunk, including a reserved first chunk. Linux commits numpy.empty pages only as they are written,
+#but Windows commits the whole allocation up front, so recordings longer than this grow chunk by chunk.
+RESERVE_BYTES = 2 ** 28
+
+
+'''
+Growable recording buffer made of fixed-size (numChan, chunkSize) chunks. Appending a block copies it
+into the current chunk and only allocates when a chunk fills, so the cost per block does not depend on
+the length of the session. chunkSize is in samples per channel and defaults to CHUNK_BYTES worth of
+samples. reserve sizes the first chunk for the expected session length instead; if the whole session fits
+in it, toArray() is zero-copy. No chunk is larger than RESERVE_BYTES, whatever the channel count.
+'''
+class ChunkedBuffer:
+    def __init__(self, numChan, chunkSize=None, dtype=numpy.float64, reserve=None):
+        self.numChan = numChan
+        self.dtype = numpy.dtype(dtype)
+        maxSamples = max(1, RESERVE_BYTES // (numChan * self.dtype.itemsize))
+        if chunkSize is None:
+            chunkSize = CHUNK_BYTES // (numChan * self.dtype.itemsize)
+        self.chunkSize = max(1, min(chunkSize, maxSamples))
+        firstSize = self.chunkSize if reserve is None else max(1, min(reserve, maxSamples))
+        self.chunks = [numpy.empty((numChan, firstSize), dtype=self.dtype)]
+        self.fill = 0
+        self.numSamp = 0
+
+    def __len__(self):
+        return self.numSamp
+
+    '''
+    Copies a (numChan, n) block onto the end of the recording
+    '''
+    def append(self, block):
+        numNew = block.shape[1]
+        start = 0
+        while start < numNew:
+            chunk = self.chunks[-1]
+            if self.fill == chunk.shape[1]:
+                chunk = numpy.empty((self.numChan, self.chunkSize), dtype=self.dtype)
+                self.chunks.append(chunk)
+                self.fill = 0
+
+            count = min(numNew - start, chunk.shape[1] - self.fill)
+            chunk[:, self.fill:self.fill + count] = block[:, start:start + count]
+            self.fill += count
+            start += count
+
+        self.numSamp += numNew
+
+    '''
+    Returns the last numSamples samples (or fewer if not yet recorded) as a (numChan, n) array.
+    This is a view when the samples all lie in the newest chunk.
+    '''
+    def latest(self, numSamples):
+        numSamples = min(numSamples, self.numSamp)
+        if numSamples <= self.fill:
+            return self.chunks[-1][:, self.fill - numSamples:self.fill]
+
+        parts = [self.chunks[-1][:, :self.fill]]
+        remaining = numSamples - self.fill
+        for chunk in reversed(self.chunks[:-1]):
+            take = min(remaining, chunk.shape[1])
+            parts.insert(0, chunk[:, chunk.shape[1] - take:])
+            remaining -= take
+            if remaining == 0:
+                break
+        return numpy.concatenate(parts, axis=1)
+
+    '''
+    Returns the full recording as one (numChan, numSamp) array. If everything fits in the first chunk this
+    is a view of it, otherwise the chunks are joined once and replaced by the joined array, so later calls
+    (and later appends, which start a new chunk) do not copy it again.
+    '''
+    def toArray(self):
+        if len(self.chunks) > 1:
+            parts = self.chunks[:-1] + [self.chunks[-1][:, :self.fill]]
+            self.chunks = [numpy.concatenate(parts, axis=1)]
+            self.fill = self.numSamp
+        return self.chunks[0][:, :self.fill]
+
+
+'''
+Fixed-size circular buffer holding the most recent capacity samples of every channel,
+used for live display where only the last few seconds matter.
+'''
+class RingBuffer:
+    def __init__(self, numChan, capacity, dtype=numpy.float64):
+        self.numChan = numChan
+        self.capacity = capacity
+        self.data = numpy.zeros((numChan, capacity), dtype=dtype)
+        self.head = 0
+        self.numSamp = 0
+
+    def __len__(self):
+        return min(self.numSamp, self.capacity)
+
+    '''
+    Writes a (numChan, n) block, overwriting the oldest samples
+    '''
+    def append(self, block):
+        numNew = block.shape[1]
+        self.numSamp += numNew
+        if numNew >= self.capacity:
+            self.data[:] = block[:, numNew - self.capacity:]
+            self.head = 0
+            return
+
+        end = self.head + numNew
+        if end <= self.capacity:
+            self.data[:, self.head:end] = block
+        else:
+            split = self.capacity - self.head
+            self.data[:, self.head:] = block[:, :split]
+            self.data[:, :end - self.capacity] = block[:, split:]
+        self.head = end % self.capacity
+
+    '''
+    Returns the buffered samples in time order as a (numChan, n) array
+    '''
+    def latest(self):
+        if self.numSamp < self.capacity:
+            return self.data[:, :self.head]
+        return numpy.concatenate((self.data[:, self.head:], self.data[:, :self.head]), axis=1)
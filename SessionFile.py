@@ -0,0 +1,125 @@
+import struct
+import time
+import numpy
+
+'''
+Date: October, 2026
+Summary: Binary session files (.dgs) for recordings. A file is a fixed 64 byte header (channel count,
+sample type, sample rate and start timestamp) followed by raw little-endian samples with channels as
+columns, so blocks can be appended while recording and the finished file opened as a numpy.memmap.
+Also loads recordings saved in the other supported formats (.npy and .txt).
+'''
+
+SESSION_EXT = '.dgs'
+MAGIC = b'DGSESS\x00\x00'
+VERSION = 1
+HEADER_SIZE = 64
+#magic, version, bytes per sample, number of channels, sample rate (Hz), start time (Unix seconds)
+HEADER_FORMAT = '<8sHHIdd'
+DTYPES = {4: numpy.dtype('<f4'), 8: numpy.dtype('<f8')}
+
+
+'''
+Helper function that packs the session header, padded to HEADER_SIZE bytes
+'''
+def packHeader(numChan, sampleRate, dtype, startTime):
+    header = struct.pack(HEADER_FORMAT, MAGIC, VERSION, numpy.dtype(dtype).itemsize,
+                         numChan, float(sampleRate), float(startTime))
+    return header.ljust(HEADER_SIZE, b'\x00')
+
+
+'''
+Reads the header of a session file and returns it as a dictionary, including the
+number of samples implied by the file size (so files cut short by a crash still open)
+'''
+def readHeader(path):
+    with open(path, 'rb') as file:
+        raw = file.read(HEADER_SIZE)
+        file.seek(0, 2)
+        fileSize = file.tell()
+
+    if len(raw) < HEADER_SIZE:
+        raise ValueError(str(path) + ' is too short to be a session file')
+    magic, version, itemSize, numChan, sampleRate, startTime = struct.unpack_from(HEADER_FORMAT, raw)
+    if magic != MAGIC or itemSize not in DTYPES:
+        raise ValueError(str(path) + ' is not a session file')
+
+    frameSize = itemSize * numChan
+    return {'version': version, 'dtype': DTYPES[itemSize], 'numChan': numChan, 'sampleRate': sampleRate,
+            'startTime': startTime, 'numSamp': (fileSize - HEADER_SIZE) // frameSize}
+
+
+'''
+Opens a session file without parsing it. Returns the header dictionary and a
+read-only (numSamp, numChan) memmap of the samples.
+'''
+def openSession(path, mode='r'):
+    info = readHeader(path)
+    if info['numSamp'] == 0:
+        return info, numpy.zeros((0, info['numChan']), dtype=info['dtype'])
+    samples = numpy.memmap(path, dtype=info['dtype'], mode=mode, offset=HEADER_SIZE,
+                           shape=(info['numSamp'], info['numChan']))
+    return info, samples
+
+
+'''
+Writes a complete recording already held in memory (channels as columns) to a session file
+'''
+def saveSession(path, data, sampleRate, dtype=numpy.float32, startTime=None):
+    data = numpy.asarray(data)
+    data = data.reshape(len(data), -1)
+    with SessionWriter(path, data.shape[1], sampleRate, dtype=dtype, startTime=startTime) as writer:
+        writer.write(data.T)
+
+
+'''
+Loads a recording (.npy, session file or .txt, channels as columns) as a (numSamp, numChan) array.
+Binary formats are read without parsing; with mmap set, .npy and session files are memory-mapped
+instead of read into memory. Single channel recordings saved as 1-D arrays get one column.
+'''
+def loadRecording(path, mmap=False):
+    path = str(path)
+    if path.endswith('.npy'):
+        data = numpy.load(path, mmap_mode='r' if mmap else None)
+    elif path.endswith(SESSION_EXT):
+        data = openSession(path)[1]
+        if not mmap:
+            data = numpy.array(data)
+    else:
+        data = numpy.loadtxt(path)
+    return data.reshape(len(data), -1)
+
+
+'''
+Appends (numChan, n) blocks to a session file as they are acquired, so a recording
+never has to be held in memory. Can be used as a context manager.
+'''
+class SessionWriter:
+    def __init__(self, path, numChan, sampleRate, dtype=numpy.float32, startTime=None):
+        self.path = path
+        self.numChan = numChan
+        self.dtype = DTYPES[numpy.dtype(dtype).itemsize]
+        self.numSamp = 0
+        if startTime is None:
+            startTime = time.time()
+
+        self.file = open(path, 'wb')
+        self.file.write(packHeader(numChan, sampleRate, self.dtype, startTime))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    '''
+    Appends a channel-major block to the file, interleaving it so channels are columns on disk
+    '''
+    def write(self, block):
+        frames = numpy.ascontiguousarray(numpy.transpose(block), dtype=self.dtype)
+        self.file.write(frames.data)
+        self.numSamp += frames.shape[0]
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
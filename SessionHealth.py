@@ -0,0 +1,99 @@
+import json
+import time
+import numpy
+
+'''
+Date: October, 2026
+Summary: Sample timing instrumentation for recordings. The acquisition thread records the host time,
+size and DAQ buffer backlog of every block it reads, plus buffer overruns and buffer pool misses. The
+session health report derived from these (effective rate, gaps, jitter) is saved next to the data so
+the time axis of a recording can be checked afterwards.
+'''
+
+#Extension appended to a data file's name for its health report
+HEALTH_EXT = '.health.json'
+
+#Block intervals longer than this many nominal block durations are reported as gaps
+GAP_FACTOR = 2.0
+
+
+'''
+Collects per-block timing while a stream runs. record() is called from the acquisition thread
+only, and the lists are only read once the stream has stopped.
+'''
+class TimingMonitor:
+    def __init__(self, sampFreq):
+        self.sampFreq = sampFreq
+        self.startTime = time.time()
+        self.timestamps = []
+        self.blockSizes = []
+        self.backlogs = []
+        self.overruns = 0
+        self.poolMisses = 0
+
+    '''
+    Records a block of numSamp samples per channel that finished reading at timestamp (perf_counter),
+    with backlog samples per channel still waiting in the DAQ buffer
+    '''
+    def record(self, numSamp, timestamp, backlog):
+        self.timestamps.append(timestamp)
+        self.blockSizes.append(numSamp)
+        self.backlogs.append(backlog)
+
+    '''
+    Returns the session health report as a dictionary (times in ms)
+    '''
+    def report(self):
+        sizes = numpy.array(self.blockSizes, dtype=numpy.int64)
+        times = numpy.array(self.timestamps)
+        health = {'startTime': self.startTime, 'nominalRate': self.sampFreq, 'numSamp': int(sizes.sum()),
+                  'numBlocks': len(sizes), 'effectiveRate': None, 'gaps': 0, 'maxGapMs': 0.0,
+                  'maxJitterMs': 0.0, 'maxBacklog': int(max(self.backlogs, default=0)),
+                  'overruns': self.overruns, 'poolMisses': self.poolMisses}
+        if len(sizes) < 2:
+            return health
+
+        #Rate over everything after the first block, whose start time is unknown
+        intervals = numpy.diff(times)
+        expected = sizes[1:] / self.sampFreq
+        health['effectiveRate'] = float(sizes[1:].sum() / (times[-1] - times[0])) if times[-1] > times[0] else None
+
+        jitter = intervals - expected
+        gapMask = intervals > GAP_FACTOR * expected
+        health['maxJitterMs'] = float(numpy.abs(jitter).max() * 1000)
+        health['gaps'] = int(gapMask.sum())
+        health['maxGapMs'] = float(intervals[gapMask].max() * 1000) if gapMask.any() else 0.0
+        return health
+
+    '''
+    Helper function that returns True if the report shows lost samples or a time axis that cannot be trusted
+    '''
+    def unhealthy(self):
+        health = self.report()
+        return health['overruns'] > 0 or health['gaps'] > 0
+
+    '''
+    Saves the health report and per-block timing next to the data file at dataPath
+    '''
+    def save(self, dataPath):
+        health = self.report()
+        startPerf = self.timestamps[0] if self.timestamps else 0.0
+        health['blocks'] = [[size, round(stamp - startPerf, 6), backlog] for size, stamp, backlog
+                            in zip(self.blockSizes, self.timestamps, self.backlogs)]
+        with open(str(dataPath) + HEALTH_EXT, 'w') as file:
+            json.dump(health, file, indent=1)
+
+
+'''
+Helper function for the interfaces that prints the session health report and warns the user if samples
+were lost or reads were late enough that the time axis should be checked. Tk is only imported here, so
+headless use of this module does not load it.
+'''
+def checkHealth(monitor):
+    from tkinter import messagebox
+
+    health = monitor.report()
+    print('Session health: ' + str(health))
+    if monitor.unhealthy():
+        messagebox.showwarning('Timing Warning', 'Samples may be missing or late: ' + str(health['overruns']) +
+                               ' overrun(s), ' + str(health['gaps']) + ' gap(s) between blocks.')